@@ -1,34 +1,230 @@
+import copy
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import subprocess
 import sys
 from urllib.parse import urlencode
 from pathlib import Path
 from project_paths import get_mdat_dir, ensure_data_dirs
+from response_cache import ResponseCache
+from rew_metrics import RequestMetrics
+
+# REW processes launched from this interpreter, keyed by API port
+_launched_processes = {}
+
+# settings endpoints whose last applied value is mirrored so identical
+# POSTs can be skipped
+CONFIG_ENDPOINTS = (
+    "/measure/sweep/configuration",
+    "/measure/no-overall-average",
+    "/audio/driver",
+    "/audio/asio/device",
+    "/audio/asio/input",
+    "/audio/asio/output",
+    "/stepped-measurement/fft-configuration",
+    "/stepped-measurement/frequency-span",
+    "/stepped-measurement/options",
+    "/stepped-measurement/type",
+)
+
+# command endpoints whose POSTs can add, remove or reorder measurements, ids
+# are list positions so the id -> uuid map is dropped after them
+MEASUREMENT_LIST_COMMANDS = (
+    "/measure/command",
+    "/stepped-measurement/command",
+    "/measurements/command",
+)
+
+
+def _changes_measurement_list(request_ext: str):
+    path = request_ext.split("?", 1)[0]
+    return path in MEASUREMENT_LIST_COMMANDS or (
+        path.startswith("/measurements/") and path.endswith("/command"))
+
+
+def _normalize_config_value(value):
+    # REW reports back numbers and booleans that were posted as strings,
+    # e.g. "true" -> true and 1 -> 1.0, so compare them loosely
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        try:
+            return float(lowered)
+        except ValueError:
+            return lowered
+    return value
+
+
+def config_matches(current, desired):
+    """ Function to check if a settings value already matches what is wanted
+
+    For dicts only the keys in desired are compared, extra keys that REW
+    reports are ignored.
+
+    Args:
+        current: the value REW has (or was last sent)
+        desired: the value about to be sent
+
+    Returns:
+        matches (bool): True if sending desired would change nothing
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        return all(key in current
+                   and config_matches(current[key], value)
+                   for key, value in desired.items())
+    return _normalize_config_value(current) == \
+        _normalize_config_value(desired)
+
+
+def make_session(pool_connections: int = 1, pool_maxsize: int = 8,
+                 max_retries: int = 0):
+    """ Function to build a pooled keep-alive session for REW requests
+
+    Args:
+        pool_connections (int): number of host pools to keep
+        pool_maxsize (int): max connections kept alive per host
+        max_retries (int): connection retries per request
+
+    Returns:
+        session (requests.Session): the configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=max_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def send_request(session, metrics, method: str, base_url: str,
+                 request_ext: str, timeout, data=None):
+    """ Function to send one request and record it in metrics
+
+    Args:
+        session (requests.Session): the session to send with
+        metrics (RequestMetrics | None): where latency and sizes are recorded
+        method (str): "GET" or "POST"
+        base_url (str): address and port of REW
+        request_ext (str): the extension of the request to be made
+        timeout (float | tuple): the request timeout
+        data: the json body of a POST
+
+    Returns:
+        response (requests.Response): the response from REW
+    """
+    start = time.perf_counter()
+    try:
+        if method == "POST":
+            response = session.post(base_url + request_ext, json=data,
+                                    timeout=timeout)
+        else:
+            response = session.get(base_url + request_ext, timeout=timeout)
+    except requests.RequestException:
+        if metrics is not None:
+            metrics.record(method, request_ext, time.perf_counter() - start,
+                           error=True)
+        raise
+    if metrics is not None:
+        body = response.request.body or b""
+        metrics.record(method, request_ext, time.perf_counter() - start,
+                       request_bytes=len(body),
+                       response_bytes=len(response.content),
+                       error=response.status_code >= 400)
+    return response
+
+
+def freq_response_request_ext(id: str, smoothing=None, unit=None, ppo=None):
+    """ Function to build the frequency response request extension
+
+    Args:
+        id (str): the id of the measurement
+        smoothing (str | None): smoothing option, e.g. "1/12"
+        unit (str | None): unit for magnitude, e.g. "SPL"
+        ppo (int | None): points-per-octave for log spacing
+
+    Returns:
+        request_ext (str): the request extension including the query
+    """
+    request_ext = "/measurements/" + str(id) + "/frequency-response"
+    query_parts = []
+    if smoothing:
+        smoothing_value = str(smoothing)
+        if not (smoothing_value.startswith('"') and smoothing_value.endswith('"')):
+            smoothing_value = f"\"{smoothing_value}\""
+        query_parts.append(f"smoothing={smoothing_value}")
+    if unit:
+        query_parts.append(f"unit={unit}")
+    if ppo:
+        query_parts.append(f"ppo={ppo}")
+    if query_parts:
+        request_ext = request_ext + "?" + "&".join(query_parts)
+    return request_ext
 
 
 class REWAutomation():
     def __init__(self,
                  rew_address: str = "http://localhost",
                  port: int = 4735,
-                 rew_filepath: str = ""):
+                 rew_filepath: str = "",
+                 timeout: float | tuple = (3.05, 120.0),
+                 pool_connections: int = 1,
+                 pool_maxsize: int = 8,
+                 max_retries: int = 0,
+                 cache_max_bytes: int = 64 * 1024 * 1024,
+                 launch: str = "auto"):
         """ Initializes the REW software and API
 
         Establishes a connection to the REW executable in either windows or
         macOS environments
         and sets up the API at the default local port 4735.
 
+        With launch="auto" the port is probed first and an REW that is
+        already running is attached to, REW is only started if nothing
+        answers. "always" starts REW without probing and "never" only
+        attaches.
+
+        All requests go through one pooled keep-alive session, so a run of
+        API calls reuses the same TCP connection(s) to REW instead of
+        opening a new one for every call. Call close() (or use the object
+        as a context manager) to release the pooled connections.
+
         Args:
             rew_address (str): the rew address
             port (int): the default port REW hosts on
             rew_filepath (str): an empty string for now, but will be used
                                 to specify the filepath of REW
+            timeout (float | tuple): default per-request timeout in seconds,
+                                     either one value or (connect, read)
+            pool_connections (int): number of host pools to keep
+            pool_maxsize (int): max connections kept alive per host
+            max_retries (int): connection retries per request
+            cache_max_bytes (int): size limit of the frequency response
+                                   cache, 0 turns the cache off
+            launch (str): "auto", "always" or "never"
 
         Returns:
             N/A
 
         """
         self.rew_address = rew_address
+        self.timeout = timeout
+        self.session = make_session(pool_connections, pool_maxsize,
+                                    max_retries)
+        self.response_cache = ResponseCache(cache_max_bytes)
+        self.metrics = RequestMetrics()
+        # endpoint -> (last applied settings, response to that POST, None
+        # if the settings were read by sync_config)
+        self._applied_config = {}
+        self.skipped_config_posts = 0
+        # id -> (uuid, date) as last reported by /measurements
+        self._measurement_index = {}
         if rew_filepath == "":
             if sys.platform == "win32":
                 # use default REW filepath for Windows
@@ -36,31 +232,133 @@ class REWAutomation():
             elif sys.platform == "darwin":
                 self.rew_filepath = '/Applications/REW/REW.app'
             else:
-                raise OSError("REWAutomation couldn't find REW on this \
-                              platform, please specify the rew_filepath \
-                              argument in the constructor")
-
+                self.rew_filepath = ""
         else:
             self.rew_filepath = rew_filepath
         self.port = port
         self.is_server_up = False
-        if sys.platform == "win32":
-            subprocess.Popen([self.rew_filepath,
-                              '-api',
-                              # '-nogui',
-                              '-port',
-                              str(self.port)
-                              ])
-        elif sys.platform == "darwin":
-            subprocess.Popen(['open',
-                              '-a',
-                              self.rew_filepath,
-                              '--args',
-                              '-api',
-                              # '-nogui',
-                              '-port',
-                              str(self.port)
-                              ])
+        self.startup_metrics = {}
+        # startup timing counts from the spawn, or from here if attached
+        self._started_at = time.perf_counter()
+        self._spawned = False
+        self.process = None
+        self.owns_process = False
+        if launch not in ("auto", "always", "never"):
+            raise ValueError(f"unknown launch mode: {launch}")
+        if launch == "auto" and self.probe():
+            # REW is already up on this port, attach instead of launching
+            self.is_server_up = True
+            return
+        if launch != "never":
+            self.launch()
+
+    def launch(self):
+        """ Function to start REW with its API server on self.port
+
+        A REW process started earlier from this interpreter on the same
+        port is reused while it is still running, so re-running the setup
+        does not start a second REW.
+
+        Args:
+            None
+
+        Returns:
+            process (subprocess.Popen): the handle of the REW process
+        """
+        process = _launched_processes.get(self.port)
+        if process is not None and process.poll() is None:
+            self.process = process
+            self.owns_process = True
+            return process
+
+        if sys.platform == "darwin":
+            # open hands REW to launchd and exits, so this handle only
+            # tracks the open call and REW is found again by probe()
+            command = ['open',
+                       '-a',
+                       self.rew_filepath,
+                       '--args',
+                       '-api',
+                       # '-nogui',
+                       '-port',
+                       str(self.port)
+                       ]
+        elif self.rew_filepath:
+            command = [self.rew_filepath,
+                       '-api',
+                       # '-nogui',
+                       '-port',
+                       str(self.port)
+                       ]
+        else:
+            raise OSError("REWAutomation couldn't find REW on this \
+                          platform, please specify the rew_filepath \
+                          argument in the constructor")
+        # a new REW starts with default settings and no measurements
+        self.forget_config()
+        self.invalidate_response_cache()
+        self._started_at = time.perf_counter()
+        self._spawned = True
+        self.process = subprocess.Popen(command)
+        self.owns_process = True
+        _launched_processes[self.port] = self.process
+        return self.process
+
+    def shutdown(self, timeout: float = 10.0):
+        """ Function to shut down REW and release the connections
+
+        Sends the Shutdown command, then waits for the REW process if this
+        object launched it.
+
+        Args:
+            timeout (float): seconds to wait for the process to exit
+
+        Returns:
+            N/A
+        """
+        try:
+            self.post_command_shutdown()
+        except requests.RequestException:
+            pass
+        if self.owns_process and self.process is not None:
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+            if _launched_processes.get(self.port) is self.process:
+                del _launched_processes[self.port]
+        self.is_server_up = False
+        # the next REW starts with default settings and no measurements
+        self.forget_config()
+        self.invalidate_response_cache()
+        self.close()
+
+    def close(self):
+        """ Function to close the pooled session and its connections
+
+        Args:
+            None
+
+        Returns:
+            N/A
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _url(self, request_ext: str):
+        return self.rew_address + ":" + str(self.port) + request_ext
+
+    def _send(self, method: str, request_ext: str, timeout=None, data=None):
+        if timeout is None:
+            timeout = self.timeout
+        return send_request(self.session, self.metrics, method, self._url(""),
+                            request_ext, timeout, data)
 
     def get_application_commands(self):
         """ Function to get all application commands
@@ -74,37 +372,108 @@ class REWAutomation():
         get_response = self.get_request("/application/commands")
         return get_response
 
+    def probe(self, probe_endpoint: str = "/version",
+              timeout: float = 0.5):
+        """ Function to check once if the REW API server is answering
+
+        Any HTTP response below 500 counts as up, so the probe only needs
+        the server to be listening and does not depend on the reply body.
+
+        Args:
+            probe_endpoint (str): a cheap endpoint to request
+            timeout (float): connect and read timeout for the probe
+
+        Returns:
+            is_up (bool): True if REW answered, False if not
+        """
+        try:
+            response = self._send("GET", probe_endpoint, timeout)
+        except requests.RequestException:
+            return False
+        return response.status_code < 500
+
+    def wait_until_ready(self, timeout: float | None = 60.0,
+                         initial_delay: float = 0.02,
+                         max_delay: float = 1.0,
+                         backoff: float = 2.0,
+                         probe_endpoint: str = "/version"):
+        """ Function to wait for the REW API with exponential backoff
+
+        Probes start tens of milliseconds apart and back off up to
+        max_delay, so a REW that is already up is found almost at once and
+        a cold start is not hammered. The outcome is kept in
+        startup_metrics.
+
+        Args:
+            timeout (float | None): overall deadline in seconds, None waits
+                                    forever
+            initial_delay (float): delay after the first failed probe
+            max_delay (float): upper limit of the delay between probes
+            backoff (float): factor the delay grows by after each probe
+            probe_endpoint (str): the endpoint used by probe()
+
+        Returns:
+            is_server_up (bool): True if REW is ready, False if the
+                                 deadline passed first
+        """
+        wait_start = time.perf_counter()
+        deadline = None if timeout is None else wait_start + timeout
+        delay = initial_delay
+        attempts = 0
+        while True:
+            attempts += 1
+            if self.probe(probe_endpoint):
+                self.is_server_up = True
+                break
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                break
+            sleep_for = delay
+            if deadline is not None:
+                sleep_for = min(sleep_for, deadline - now)
+            time.sleep(sleep_for)
+            delay = min(delay * backoff, max_delay)
+
+        ready_at = time.perf_counter()
+        self.startup_metrics = {
+            "ready": self.is_server_up,
+            "spawned": self._spawned,
+            "probe_attempts": attempts,
+            "wait_seconds": ready_at - wait_start,
+            "seconds_to_ready": (ready_at - self._started_at
+                                 if self.is_server_up else None),
+        }
+        return self.is_server_up
+
     def is_server_setup(self):
         """ Function to check if REW is ready to accept requests
 
+        Blocks until REW answers, see wait_until_ready for a version with
+        a deadline.
+
         Args:
             None
 
         Returns:
             is_server_up (bool): True if REW is ready, False if not
         """
-        while self.is_server_up is False:
-            try:
-                self.get_application_commands()
-                print("REW is ready")
-                self.is_server_up = True
-            except Exception:
-                print("REW is not ready. Retrying in 1 second.")
-                time.sleep(1)  # wait a second before attempting request again
+        if not self.is_server_up:
+            self.wait_until_ready(timeout=None)
+            print("REW is ready")
         return self.is_server_up
 
-    def get_request(self, request_ext: str):
+    def get_request(self, request_ext: str, timeout=None):
         """ Function to make a GET request to the REW API
 
         Args:
             request_ext (str): the extension of the request to be made
+            timeout (float | tuple | None): overrides the default timeout
 
         Returns:
             response (dict): the response from the request
 
         """
-        response = requests.get(self.rew_address +
-                                ":" + str(self.port) + request_ext)
+        response = self._send("GET", request_ext, timeout)
         return response.json()
 
     def load_mdat(self, filepath: str):
@@ -125,6 +494,8 @@ class REWAutomation():
 
         post_response = self.post_request("/measurements/command",
                                           body_to_load)
+        # loading replaces the measurements, so nothing cached is valid
+        self.invalidate_response_cache()
         return post_response
 
     def save_mdat(self, filepath: str):
@@ -157,8 +528,70 @@ class REWAutomation():
             measurements (dict): all measurements
         """
         get_response = self.get_request("/measurements")
+        if isinstance(get_response, dict):
+            self._update_measurement_index(get_response)
         return get_response
 
+    def _update_measurement_index(self, measurements: dict):
+        """ Function to drop cached responses of changed measurements
+
+        Compares the uuid and date of every measurement with what the last
+        /measurements call reported. Cached responses of measurements that
+        were removed, replaced or re-dated are dropped.
+
+        Args:
+            measurements (dict): the /measurements response
+
+        Returns:
+            N/A
+        """
+        new_index = {}
+        for meas_id, meas in measurements.items():
+            if isinstance(meas, dict):
+                new_index[str(meas_id)] = (meas.get("uuid"), meas.get("date"))
+        unchanged = set(new_index.values()) & set(
+            self._measurement_index.values())
+        stale = {uuid for uuid, date in self._measurement_index.values()
+                 if (uuid, date) not in unchanged}
+        if stale:
+            self.response_cache.invalidate(lambda key: key[0] in stale)
+        self._measurement_index = new_index
+
+    def invalidate_response_cache(self):
+        """ Function to drop every cached response and known measurement
+
+        Args:
+            None
+
+        Returns:
+            N/A
+        """
+        self.response_cache.clear()
+        self._measurement_index = {}
+
+    def _measurement_uuid(self, id: str):
+        """ Function to get the uuid of a measurement id
+
+        Uses the last /measurements response, and asks REW for that one
+        measurement if the id is not known yet. The map is dropped after
+        every command that can change the measurement list, since REW ids
+        are positions in that list.
+
+        Args:
+            id (str): the id of the measurement
+
+        Returns:
+            uuid (str | None): the uuid of the measurement
+        """
+        known = self._measurement_index.get(str(id))
+        if known is not None:
+            return known[0]
+        meas = self.get_measurements_id(str(id))
+        if not isinstance(meas, dict) or not meas.get("uuid"):
+            return None
+        self._measurement_index[str(id)] = (meas.get("uuid"), meas.get("date"))
+        return meas.get("uuid")
+
     def get_measurements_id(self, id: str):
         """ Function to get a measurement by its id#
 
@@ -172,34 +605,41 @@ class REWAutomation():
         return get_response
 
     def get_measurements_id_freq_response(self, id: str, smoothing=None,
-                                          unit=None, ppo=None):
+                                          unit=None, ppo=None,
+                                          use_cache: bool = True):
         """ Function to get the frequency response of a specified measurement
 
+        Responses are cached by (measurement uuid, smoothing, unit, ppo), so
+        asking again for a measurement that has not changed is served from
+        memory. The returned dict is shared with the cache and should not be
+        modified.
+
         Args:
             id (str): the id of the measurement whose frequency response it
                         to be retrieved
             smoothing (str | None): smoothing option, e.g. "1/12"
             unit (str | None): unit for magnitude, e.g. "SPL"
             ppo (int | None): points-per-octave for log spacing
+            use_cache (bool): False always asks REW
 
         Returns:
             measurement (dict): the frequency response of the
                                 specified measurement
         """
-        get_request_body = "/measurements/" + id + "/frequency-response"
-        query_parts = []
-        if smoothing:
-            smoothing_value = str(smoothing)
-            if not (smoothing_value.startswith('"') and smoothing_value.endswith('"')):
-                smoothing_value = f"\"{smoothing_value}\""
-            query_parts.append(f"smoothing={smoothing_value}")
-        if unit:
-            query_parts.append(f"unit={unit}")
-        if ppo:
-            query_parts.append(f"ppo={ppo}")
-        if query_parts:
-            get_request_body = get_request_body + "?" + "&".join(query_parts)
+        get_request_body = freq_response_request_ext(id, smoothing, unit, ppo)
+        cache_key = None
+        if use_cache and self.response_cache.max_bytes > 0:
+            uuid = self._measurement_uuid(id)
+            if uuid is not None:
+                smoothing_key = str(smoothing).strip('"') if smoothing else None
+                cache_key = (uuid, smoothing_key, unit, ppo)
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
         get_response = self.get_request(get_request_body)
+        if cache_key is not None and isinstance(get_response, dict) \
+                and "magnitude" in get_response:
+            self.response_cache.put(cache_key, get_response)
         return get_response
 
     def get_measurements_frequency_response_smoothing_choices(self):
@@ -247,20 +687,90 @@ class REWAutomation():
         get_response = self.get_request(get_request_body)
         return get_response
 
-    def post_request(self, request_ext: str, data: dict):
+    def post_request(self, request_ext: str, data: dict, timeout=None):
         """ Function to make a POST request to REW API
 
         Args:
             request_ext (str): the extension of the request to be made
             data (dict): the data to be sent in the request
+            timeout (float | tuple | None): overrides the default timeout
 
         Returns:
             N/A
         """
-        response = requests.post(self.rew_address + ':'
-                                 + str(self.port) + request_ext, json=data)
+        response = self._send("POST", request_ext, timeout, data)
+        if _changes_measurement_list(request_ext):
+            # ids may now point at other measurements, cached responses
+            # stay valid as they are keyed by uuid
+            self._measurement_index = {}
         return response.json()
 
+    def post_config(self, request_ext: str, data, force: bool = False):
+        """ Function to POST a setting only when it differs from REW's
+
+        The last applied value of every settings endpoint is mirrored, so
+        sending the same configuration again (e.g. for every unit of a
+        batch) is skipped and the response of the earlier POST is returned.
+
+        Args:
+            request_ext (str): the settings endpoint
+            data: the settings to be sent
+            force (bool): True always sends the POST
+
+        Returns:
+            response (dict | None): the response from REW, or the mirrored
+                                    one. None if the POST was skipped
+                                    because sync_config read the same
+                                    settings from REW, which never sent a
+                                    POST response for them
+        """
+        applied = self._applied_config.get(request_ext)
+        if not force and applied is not None \
+                and config_matches(applied[0], data):
+            self.skipped_config_posts += 1
+            return applied[1]
+        response = self._send("POST", request_ext, data=data)
+        body = response.json()
+        if response.ok:
+            self._applied_config[request_ext] = (copy.deepcopy(data), body)
+        else:
+            self._applied_config.pop(request_ext, None)
+        return body
+
+    def sync_config(self, endpoints=CONFIG_ENDPOINTS):
+        """ Function to fill the settings mirror from REW's current state
+
+        GETs every settings endpoint so the first POST of a setting REW
+        already has is skipped too, such a skipped post_config returns None.
+        Endpoints that fail are left out.
+
+        Args:
+            endpoints (tuple): the settings endpoints to be read
+
+        Returns:
+            synced (list): the endpoints that were read
+        """
+        synced = []
+        for request_ext in endpoints:
+            try:
+                response = self._send("GET", request_ext)
+            except requests.RequestException:
+                continue
+            if not response.ok:
+                continue
+            try:
+                current = response.json()
+            except ValueError:
+                continue
+            # there was no POST, so there is no response to mirror
+            self._applied_config[request_ext] = (current, None)
+            synced.append(request_ext)
+        return synced
+
+    def forget_config(self):
+        """ Function to clear the settings mirror so every POST is sent """
+        self._applied_config = {}
+
     def post_measure_sweep_config(self, sweep_configuration: dict = {}):
         """HTTP POSTs measure sweep configuration to REW
 
@@ -284,8 +794,8 @@ class REWAutomation():
                 "fillSilenceWithDither": False
             }
 
-        response = self.post_request("/measure/sweep/configuration",
-                                     sweep_configuration)
+        response = self.post_config("/measure/sweep/configuration",
+                                    sweep_configuration)
         return response
 
     def post_measure_naming(self, name: str = "test", testNumber: int = 1):
@@ -330,7 +840,7 @@ class REWAutomation():
                 N/A
 
         """
-        post_response = self.post_request("/audio/driver", {"driver": driver})
+        post_response = self.post_config("/audio/driver", {"driver": driver})
         return post_response
 
     def post_audio_device(self, device: str = "Dante Virtual Soundcard (x64)"):
@@ -342,7 +852,7 @@ class REWAutomation():
             N/A
         """
         command = {"device": device}
-        post_response = self.post_request("/audio/asio/device", command)
+        post_response = self.post_config("/audio/asio/device", command)
         return post_response
 
     def post_audio_asio_input(self, input: str = "2: Dante rx 2"):
@@ -356,7 +866,7 @@ class REWAutomation():
             N/A
         """
         command = {"input": input}
-        post_response = self.post_request("/audio/asio/input", command)
+        post_response = self.post_config("/audio/asio/input", command)
         return post_response
 
     def post_audio_asio_output(self, output: str = "2: Dante rx 2"):
@@ -369,7 +879,7 @@ class REWAutomation():
             N/A
         """
         command = {"output": output}
-        post_response = self.post_request("/audio/asio/output", command)
+        post_response = self.post_config("/audio/asio/output", command)
         return post_response
 
     def post_no_overall_average(self, no_overall_average: bool = True):
@@ -384,7 +894,7 @@ class REWAutomation():
         """
         command = no_overall_average
         api_endpoint = "/measure/no-overall-average"
-        post_response = self.post_request(api_endpoint, command)
+        post_response = self.post_config(api_endpoint, command)
         return post_response
 
     def post_measurements_command_saveall(self, filename: str = "test"):
@@ -431,41 +941,41 @@ class REWAutomation():
 
     def post_stepped_measurement_FFT_configuration(self):
         fftc = "fft-configuration"
-        post_response = self.post_request(f"/stepped-measurement/{fftc}",
-                                          {
-                                            "fftLength": "16k",
-                                            "averages": 2,
-                                            "maximumOverlap": "0%",
-                                            "window": "Hann"
-                                            })
+        post_response = self.post_config(f"/stepped-measurement/{fftc}",
+                                         {
+                                           "fftLength": "16k",
+                                           "averages": 2,
+                                           "maximumOverlap": "0%",
+                                           "window": "Hann"
+                                           })
         return post_response
 
     def post_stepped_measurement_frequency_span(self):
         freSpan = "frequency-span"
-        post_response = self.post_request(f"/stepped-measurement/{freSpan}",
-                                          {
-                                            "startFreq": 50.0,
-                                            "endFreq": 1000.0,
-                                            "ppo": 3
-                                           })
+        post_response = self.post_config(f"/stepped-measurement/{freSpan}",
+                                         {
+                                           "startFreq": 50.0,
+                                           "endFreq": 1000.0,
+                                           "ppo": 3
+                                          })
         return post_response
 
     def post_stepped_measurement_options(self):
         distortionLimit = "reduceStepIfDistortionLimitHit"
-        post_response = self.post_request("/stepped-measurement/options",
-                                          {
-                                            "silenceIntervalSeconds": 0,
-                                            "captureSpectrum": "true",
-                                            "stopForHeavyClipping": "false",
-                                            "stopAtDistortionLimit": "false",
-                                            "distortionLimitPercent": 1.0,
-                                            distortionLimit: "false"
-                                            })
+        post_response = self.post_config("/stepped-measurement/options",
+                                         {
+                                           "silenceIntervalSeconds": 0,
+                                           "captureSpectrum": "true",
+                                           "stopForHeavyClipping": "false",
+                                           "stopAtDistortionLimit": "false",
+                                           "distortionLimitPercent": 1.0,
+                                           distortionLimit: "false"
+                                           })
         return post_response
 
     def post_stepped_measurement_type(self):
-        post_response = self.post_request("/stepped-measurement/type",
-                                          "THD vs frequency")
+        post_response = self.post_config("/stepped-measurement/type",
+                                         "THD vs frequency")
         return post_response
 
 
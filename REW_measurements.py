@@ -1,3 +1,5 @@
+from stepped_sine_progress import SteppedSineProgress
+
 
 class Measurements():
     def __init__(self, rew, dataH, Lea):
@@ -51,17 +53,10 @@ class Measurements():
         self.rew.post_stepped_measurement_type()
         # this is where the stepped sine measurement is run
         self.rew.post_stepped_measurement()
-        progress = self.rew.get_stepped_sine_progress()
         print("Stepped sine sweep in progress... please wait")
-        # the progress point will need to be variable and changable
-        # currently checking to see if progress is equal to the last
-        # update and if so we know the sweep is complete
-        print(progress)
-        while progress != {'point': 0, 'points': 14,
-                           'message': '14 measurements required',
-                           'timeRemainingSeconds': 0}:
-            progress = self.rew.get_stepped_sine_progress()
-            print(progress)
+        # completion comes from the point/points fields of the progress
+        # response, so this works for any frequency span
+        SteppedSineProgress(self.rew).wait(callback=print)
         print("Stepped sine sweep complete")
         steppedData = self.rew.get_measurements_distortion('1')
         return steppedData
@@ -151,23 +146,26 @@ class Measurements():
             response = self.rew.get_measurements_id_freq_response(res_field)
             # processes the reponse data into a usable format
             decoded_array = self.dataH.decode_array(response["magnitude"])
+            # the benchmark is parsed once and then served from memory
+            benchmark = self.dataH.benchmark(i+1)
             # loads in the SPL data from the benchmark file
-            print(len(decoded_array))
-            bench_array = self.dataH.load_json_column("SPL(dB)",
-                                                      self.dataH.get_bmark(i+1))
-            print(len(bench_array))
+            bench_array = benchmark.column("SPL(dB)")
             # loads in the frequency data from the benchmark file
-            freq_array = self.dataH.load_json_column("Freq(Hz)",
-                                                     self.dataH.get_bmark(i+1))
+            freq_array = benchmark.column("Freq(Hz)")
+            # the measurement's own axis, it need not match the benchmark's
+            decoded_freq = self.dataH.build_freq_array_from_response(
+                response, len(decoded_array))
             # calculates the difference between the measurment
-            # and the benchmark data
-            diff_list = self.dataH.list_dev_calc(bench_array, decoded_array)
+            # and the benchmark data on the benchmark's grid
+            diff_list = self.dataH.compare_to_benchmark(
+                bench_array, freq_array, decoded_array, decoded_freq)
             # checks if the unit passed or failed the test
-            unit_PF = self.dataH.unit_pass_fail(diff_list)
-            # creates a json file for the measurement data
+            unit_PF = self.dataH.unit_pass_fail(diff_list,
+                                                freq_array=freq_array)
+            # creates a json file for the measurement data, on its own axis
             measurementLength = (len(measurements)-num_of_mics+1+i)
             self.dataH.make_json(measurements[str(measurementLength)]["title"],
-                                 freq_array, decoded_array, measurements,
+                                 decoded_freq, decoded_array, measurements,
                                  str(len(measurements)-num_of_mics+1+i))
 
             if i == num_of_mics-1:
@@ -205,24 +203,21 @@ class Measurements():
             # res_field is a list of the measurements available
             res_field = list(measurements.keys())[(-num_of_mics)+i]
             # response is the freq response for the ith measurement
-            distortion = self.rew.get_measurements_distortion(res_field)["data"]
-            distortion_array = []
-            for j in range(0, len(distortion), 1):
-                distortion_array.extend(distortion[j])
+            distortion = self.dataH.decode_distortion(
+                self.rew.get_measurements_distortion(res_field))
             # load in the data from the benchmark for distortion
             print(len(distortion))
-            bench_data = self.dataH.load_json_column("data",
-                                                     self.dataH.get_bmark(i+3))
+            bench_data = self.dataH.benchmark(i+3).column("data")
             print(len(bench_data))
             # calculates the difference between the distortion data
-            # and the benchmark data
-            diff_list = self.dataH.list_dev_calc(bench_data, distortion_array)
+            # and the benchmark data, both flattened row by row
+            diff_list = self.dataH.list_dev_calc(bench_data, distortion.flat)
             # checks if the unit passed or failed the test
             unit_PF = self.dataH.stepped_sine_pass_fail(diff_list)
             # creates a json file for the measurement data
             self.dataH.make_stepped_json(measurements[str(len(
                             measurements)-num_of_mics+1+i)]["title"],
-                            distortion_array, measurements,
+                            distortion, measurements,
                             str(len(measurements)-num_of_mics+1+i))
 
             if i == num_of_mics-1:
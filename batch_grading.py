@@ -0,0 +1,194 @@
+import numpy as np
+from pass_fail import default_spec
+from resample import InterpWeights, same_grid, weights_for
+from binary_export import load_measurement
+
+
+class BatchResult():
+    __slots__ = ("ids", "passed", "failed_counts", "allowed_failures",
+                 "lengths", "violations_per_bin")
+
+    def __init__(self, ids, passed, failed_counts, allowed_failures, lengths,
+                 violations_per_bin):
+        """ Initializes the outcome of grading many units
+
+        Args:
+            ids (list): the id of every unit, in grading order
+            passed (np.ndarray): bool per unit
+            failed_counts (np.ndarray): failing bins per unit and band
+            allowed_failures (np.ndarray): allowed failures per band
+            lengths (np.ndarray): points every unit had
+            violations_per_bin (np.ndarray): failing units per bin
+
+        Returns:
+            N/A
+        """
+        self.ids = ids
+        self.passed = passed
+        self.failed_counts = failed_counts
+        self.allowed_failures = allowed_failures
+        self.lengths = lengths
+        self.violations_per_bin = violations_per_bin
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def pass_rate(self):
+        return float(np.mean(self.passed)) if len(self.ids) else 0.0
+
+    def failed_ids(self):
+        """ Function to get the ids of the units that failed """
+        return [self.ids[index] for index in np.flatnonzero(~self.passed)]
+
+    def __repr__(self):
+        return (f"BatchResult(units={len(self.ids)}, "
+                f"passed={int(np.count_nonzero(self.passed))})")
+
+
+class BatchGrader():
+    def __init__(self, bench_array, freq_array, spec=None,
+                 PFthreshold: float = 25.0, fail_count: int = 900,
+                 low_freq: float = 30.0, high_freq: float = 10000.0,
+                 min_length: int = 54000, chunk_size: int = 128):
+        """ Initializes a grader for many units against one benchmark
+
+        Curves are stacked chunk_size at a time into one reused float32
+        buffer, each chunk is judged with a few array operations on the
+        whole (units, bins) block. Memory stays at one chunk no matter how
+        many units are graded, 128 units of a 256k sweep take about 28 MB.
+
+        Args:
+            bench_array (np.ndarray | list): the benchmark curve
+            freq_array (np.ndarray | list): the benchmark frequency axis
+            spec (ToleranceSpec | None): the tolerance mask, if None the
+                                         +/-PFthreshold check of
+                                         unit_pass_fail is used
+            PFthreshold (float): allowed deviation in dB without a spec
+            fail_count (int): allowed failing bins without a spec
+            low_freq (float): lowest checked frequency without a spec
+            high_freq (float): highest checked frequency without a spec
+            min_length (int): units with fewer points fail, without a spec
+            chunk_size (int): units judged per chunk
+
+        Returns:
+            N/A
+        """
+        if spec is None:
+            spec = default_spec(PFthreshold, fail_count, low_freq,
+                                high_freq, min_length)
+        self.bench = np.asarray(bench_array, dtype=np.float32)
+        self.freq = freq_array
+        self.spec = spec
+        self.limits = spec.compile(freq_array)
+        self.chunk_size = chunk_size
+        if self.bench.size != self.limits.size:
+            raise ValueError("bench_array and freq_array differ in length")
+
+    def grade(self, curves, ids=None, source_freq=None):
+        """ Function to grade a stream of measured curves
+
+        Args:
+            curves (iterable): measured curves in dB, or a 2-D array (a
+                               memory-mapped one is read chunk by chunk)
+            ids (iterable | None): the id of every curve, 0..N-1 if None
+            source_freq (np.ndarray | None): the grid the curves are on if
+                                             it isn't the benchmark's, they
+                                             are resampled onto it
+
+        Returns:
+            result (BatchResult): pass/fail and failures per unit
+        """
+        weights = None
+        if source_freq is not None and not same_grid(source_freq, self.freq):
+            weights = weights_for(source_freq, self.freq)
+        return self._grade(
+            ((curve, weights) for curve in curves), ids)
+
+    def grade_files(self, paths):
+        """ Function to grade exported .json or binary measurement files
+
+        Files whose frequency axis isn't the benchmark's are resampled
+        onto it, files sharing an axis share the interpolation weights.
+
+        Args:
+            paths (iterable): the exported measurement files
+
+        Returns:
+            result (BatchResult): pass/fail per file, ids are the paths
+        """
+        paths = [str(path) for path in paths]
+        grids = []
+
+        def curves():
+            for path in paths:
+                data = load_measurement(path)
+                spl = data.get("SPL(dB)", [])
+                freq = data.get("Freq(Hz)")
+                weights = None
+                if freq is not None and len(freq) and \
+                        not same_grid(freq, self.freq):
+                    for grid, grid_weights in grids:
+                        if same_grid(freq, grid):
+                            weights = grid_weights
+                            break
+                    else:
+                        freq = np.array(freq, dtype=np.float64)
+                        weights = InterpWeights(freq, self.freq)
+                        grids.append((freq, weights))
+                yield spl, weights
+
+        return self._grade(curves(), paths)
+
+    def _grade(self, curves, ids):
+        size = self.limits.size
+        buffer = np.empty((self.chunk_size, size), dtype=np.float32)
+        lengths = np.empty(self.chunk_size, dtype=np.int64)
+        allowed = self.limits.allowed_failures
+        passed = []
+        failed_counts = []
+        all_lengths = []
+        violations_per_bin = np.zeros(size, dtype=np.int64)
+        graded_ids = []
+        ids = iter(ids) if ids is not None else None
+        filled = 0
+
+        def flush(rows):
+            block = buffer[:rows]
+            # deviation is measured minus benchmark, worked out in place
+            np.subtract(block, self.bench, out=block)
+            chunk_passed, chunk_counts, chunk_bins = \
+                self.limits.judge_deviation_batch(block, lengths[:rows])
+            passed.append(chunk_passed)
+            failed_counts.append(chunk_counts)
+            all_lengths.append(lengths[:rows].copy())
+            violations_per_bin[:] += chunk_bins
+
+        for index, (curve, weights) in enumerate(curves):
+            curve = np.asarray(curve, dtype=np.float64).ravel()
+            if weights is not None:
+                curve = weights.apply(curve)
+            length = min(curve.size, size)
+            buffer[filled, :length] = curve[:length]
+            # missing points are NaN, which is never outside a limit
+            buffer[filled, length:] = np.nan
+            lengths[filled] = curve.size if weights is None else size
+            graded_ids.append(next(ids) if ids is not None else index)
+            filled += 1
+            if filled == self.chunk_size:
+                flush(filled)
+                filled = 0
+        if filled:
+            flush(filled)
+
+        bands = len(self.spec.bands)
+        return BatchResult(
+            graded_ids,
+            np.concatenate(passed) if passed else np.zeros(0, dtype=bool),
+            (np.concatenate(failed_counts) if failed_counts
+             else np.zeros((0, bands), dtype=np.int64)),
+            allowed,
+            (np.concatenate(all_lengths) if all_lengths
+             else np.zeros(0, dtype=np.int64)),
+            violations_per_bin,
+        )
@@ -0,0 +1,335 @@
+"""Build a golden benchmark from exported measurements of known-good units.
+
+Streams through .json (make_json / make_marimo_json) and .rewb exports one
+file at a time and keeps per-bin running statistics, so memory does not
+grow with the number of units.
+
+    python benchmark_builder.py benchmarks/new.json "data/json/good/*.json"
+"""
+import argparse
+import glob
+from datetime import datetime
+import numpy as np
+from binary_export import load_measurement
+from json_stream import dump_file
+from resample import InterpWeights, same_grid
+
+
+class RunningStats():
+    def __init__(self, size: int):
+        """ Initializes per-bin running mean, variance, min and max
+
+        Uses Welford's update, which stays accurate over thousands of
+        curves where summing squares would cancel.
+
+        Args:
+            size (int): bins per curve
+
+        Returns:
+            N/A
+        """
+        self.count = 0
+        self.mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+
+    def update(self, values):
+        """ Function to add one curve
+
+        Args:
+            values (np.ndarray): one value per bin
+
+        Returns:
+            N/A
+        """
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (values - self.mean)
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class P2Quantiles():
+    def __init__(self, size: int, quantiles=(0.05, 0.5, 0.95)):
+        """ Initializes per-bin streaming quantile estimates
+
+        The P-square algorithm (Jain & Chlamtac) tracks each quantile with
+        five markers per bin and moves them with a parabolic fit as curves
+        come in, so no curve is kept. All bins and quantiles are updated
+        together, marker i of every quantile and bin is the contiguous row
+        [i] of a (5, quantiles, bins) array. The desired marker positions
+        only depend on the count, so they are not kept per bin.
+
+        Args:
+            size (int): bins per curve
+            quantiles (tuple): the quantiles to track, each in (0, 1)
+
+        Returns:
+            N/A
+        """
+        self.quantiles = tuple(float(q) for q in quantiles)
+        self.size = size
+        self.count = 0
+        p = np.array(self.quantiles)
+        self._first = np.empty((5, size))
+        self._heights = None
+        self._positions = None
+        self._desired = np.stack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p,
+                                  3 + 2 * p, 5 * np.ones_like(p)])
+        self._increments = np.stack([np.zeros_like(p), p / 2, p,
+                                     (1 + p) / 2, np.ones_like(p)])
+
+    def update(self, values):
+        """ Function to add one curve
+
+        Args:
+            values (np.ndarray): one value per bin
+
+        Returns:
+            N/A
+        """
+        if self.count < 5:
+            self._first[self.count] = values
+            self.count += 1
+            if self.count == 5:
+                heights = np.sort(self._first, axis=0)
+                self._heights = np.repeat(heights[:, None],
+                                          len(self.quantiles), axis=1)
+                self._positions = np.empty_like(self._heights)
+                self._positions[:] = np.arange(1.0, 6.0)[:, None, None]
+            return
+        self.count += 1
+        q = self._heights
+        n = self._positions
+        x = np.asarray(values, dtype=np.float64)
+
+        # markers above the new value move one position up, the outer
+        # markers follow the extremes
+        for i in (1, 2, 3):
+            n[i] += x < q[i]
+        n[4] = self.count
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        desired = self._desired + (self.count - 5) * self._increments
+
+        for i in (1, 2, 3):
+            d = desired[i, :, None] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) \
+                | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            index = np.flatnonzero(move)
+            if not index.size:
+                continue
+            # only the markers that move are worked out
+            s = np.sign(d.take(index))
+            q_low, q_mid, q_high = (q[i - 1].take(index), q[i].take(index),
+                                    q[i + 1].take(index))
+            n_low, n_mid, n_high = (n[i - 1].take(index), n[i].take(index),
+                                    n[i + 1].take(index))
+            parabolic = q_mid + s / (n_high - n_low) * (
+                (n_mid - n_low + s) * (q_high - q_mid) / (n_high - n_mid)
+                + (n_high - n_mid - s) * (q_mid - q_low) / (n_mid - n_low))
+            linear = np.where(s > 0,
+                              q_mid + (q_high - q_mid) / (n_high - n_mid),
+                              q_mid - (q_low - q_mid) / (n_low - n_mid))
+            ok = (q_low < parabolic) & (parabolic < q_high)
+            q[i].put(index, np.where(ok, parabolic, linear))
+            n[i].put(index, n_mid + s)
+
+    def quantile(self, p: float):
+        """ Function to get the current estimate of one tracked quantile
+
+        Args:
+            p (float): one of the quantiles given at init
+
+        Returns:
+            estimate (np.ndarray): one value per bin
+        """
+        index = self.quantiles.index(float(p))
+        if self.count < 5:
+            # exact while there are too few curves for the markers
+            return np.quantile(self._first[:self.count], p, axis=0)
+        return self._heights[2, index].copy()
+
+
+class BenchmarkBuilder():
+    def __init__(self, freq_array=None, quantiles=(0.05, 0.5, 0.95),
+                 envelope_sigma: float = 3.0):
+        """ Initializes a streaming golden-benchmark builder
+
+        Args:
+            freq_array (np.ndarray | None): the benchmark frequency axis,
+                                            the axis of the first curve if
+                                            None
+            quantiles (tuple): per-bin quantiles written as P<q> columns
+            envelope_sigma (float): the tolerance envelope is the mean
+                                    +/- this many standard deviations
+
+        Returns:
+            N/A
+        """
+        self.freq = (None if freq_array is None
+                     else np.asarray(freq_array, dtype=np.float64))
+        self.quantiles = tuple(quantiles)
+        self.envelope_sigma = envelope_sigma
+        self.stats = None
+        self.percentiles = None
+        self.sources = 0
+        self.skipped = {}
+        self._grids = []
+
+    def _weights_for(self, freq):
+        for grid, weights in self._grids:
+            if same_grid(freq, grid):
+                return weights
+        weights = InterpWeights(freq, self.freq)
+        self._grids.append((np.array(freq, dtype=np.float64), weights))
+        return weights
+
+    def add(self, spl_array, freq_array=None):
+        """ Function to add the curve of one known-good unit
+
+        Curves on another frequency axis are resampled onto the benchmark's.
+
+        Args:
+            spl_array (np.ndarray | list): the SPL curve in dB
+            freq_array (np.ndarray | list | None): its frequency axis, the
+                                                   benchmark's if None
+
+        Returns:
+            N/A
+        """
+        spl = np.asarray(spl_array, dtype=np.float64).ravel()
+        if self.freq is None:
+            if freq_array is None:
+                raise ValueError("the first curve needs a frequency axis")
+            self.freq = np.asarray(freq_array, dtype=np.float64)
+        if freq_array is not None and len(freq_array) \
+                and not same_grid(freq_array, self.freq):
+            spl = self._weights_for(freq_array).apply(spl)
+        if spl.size != self.freq.size:
+            raise ValueError(f"expected {self.freq.size} points, "
+                             f"got {spl.size}")
+        if not np.all(np.isfinite(spl)):
+            raise ValueError("curve has non-finite values")
+        if self.stats is None:
+            self.stats = RunningStats(self.freq.size)
+            self.percentiles = P2Quantiles(self.freq.size, self.quantiles)
+        self.stats.update(spl)
+        self.percentiles.update(spl)
+        self.sources += 1
+
+    def add_files(self, paths, progress=None):
+        """ Function to add exported measurement files one at a time
+
+        Files that can't be used are skipped and listed in self.skipped.
+
+        Args:
+            paths (iterable): .json or .rewb exports
+            progress (callable | None): called as progress(done, path)
+
+        Returns:
+            added (int): the number of files added
+        """
+        added = 0
+        for done, path in enumerate(paths, start=1):
+            try:
+                data = load_measurement(path)
+                self.add(data["SPL(dB)"], data.get("Freq(Hz)"))
+                added += 1
+            except (OSError, ValueError, KeyError) as exc:
+                self.skipped[str(path)] = exc
+            if progress is not None:
+                progress(done, path)
+        return added
+
+    def result(self, name: str = "golden benchmark"):
+        """ Function to get the benchmark in the benchmark file schema
+
+        Freq(Hz) and SPL(dB) (the mean) are what Data_Handling reads today,
+        the statistics and the envelope are extra columns.
+
+        Args:
+            name (str): the filename written into the benchmark
+
+        Returns:
+            benchmark (dict): the benchmark columns and its Meta Data
+        """
+        if self.stats is None:
+            raise ValueError("no curves were added")
+        std = self.stats.std
+        benchmark = {
+            "filename": name,
+            "Freq(Hz)": self.freq,
+            "SPL(dB)": self.stats.mean,
+            "Std(dB)": std,
+            "Min(dB)": self.stats.min,
+            "Max(dB)": self.stats.max,
+        }
+        for p in self.quantiles:
+            benchmark[f"P{p * 100:g}(dB)"] = self.percentiles.quantile(p)
+        benchmark["Upper(dB)"] = self.stats.mean + self.envelope_sigma * std
+        benchmark["Lower(dB)"] = self.stats.mean - self.envelope_sigma * std
+        benchmark["Meta Data"] = {
+            "Units": self.stats.count,
+            "Built": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "Quantiles": list(self.quantiles),
+            "Envelope Sigma": self.envelope_sigma,
+            "Skipped": len(self.skipped),
+        }
+        return benchmark
+
+    def write(self, filepath: str, name: str = None, compact: bool = False):
+        """ Function to write the benchmark file
+
+        Args:
+            filepath (str): where the benchmark is written
+            name (str | None): the filename field, the file name if None
+            compact (bool): write without indentation
+
+        Returns:
+            filepath (str): the path of the written file
+        """
+        benchmark = self.result(name or filepath)
+        return dump_file(benchmark, filepath, indent=None if compact else 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="the benchmark file to write")
+    parser.add_argument("inputs", nargs="+",
+                        help="exported measurements, globs are expanded")
+    parser.add_argument("--quantiles", type=float, nargs="+",
+                        default=[0.05, 0.5, 0.95])
+    parser.add_argument("--sigma", type=float, default=3.0,
+                        help="envelope width in standard deviations")
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    paths = []
+    for pattern in args.inputs:
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+    builder = BenchmarkBuilder(quantiles=args.quantiles,
+                               envelope_sigma=args.sigma)
+    added = builder.add_files(paths)
+    for path, exc in builder.skipped.items():
+        print(f"skipped {path}: {exc}")
+    if not added:
+        parser.exit(1, "no usable measurements\n")
+    builder.write(args.output, compact=args.compact)
+    print(f"wrote {args.output} from {added} measurements")
+
+
+if __name__ == "__main__":
+    main()
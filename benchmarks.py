@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+
+# benchmark file of each mic/test type, see Data_Handling.get_bmark
+BENCHMARK_FILES = {
+    "vibration": "./benchmarks/benchmark-vibration.json",
+    "acoustic": "./benchmarks/benchmark-acoustic.json",
+    "stepped-sine": "./benchmarks/stepped-sine benchmark.json",
+}
+
+
+class Benchmark():
+    def __init__(self, filepath: str, data: dict, mtime: float):
+        """ Initializes a benchmark loaded into numeric arrays
+
+        Every list column of the file becomes a read-only float64 array,
+        nested lists (the stepped sine 'data' rows) are flattened so they
+        line up with the flattened distortion data. Other fields are kept
+        as they are in meta.
+
+        Args:
+            filepath (str): the benchmark file
+            data (dict): the parsed json
+            mtime (float): modification time of the file when it was read
+
+        Returns:
+            N/A
+        """
+        self.filepath = filepath
+        self.mtime = mtime
+        self.columns = {}
+        self.meta = {}
+        for key, value in data.items():
+            if isinstance(value, list):
+                try:
+                    array = np.asarray(value, dtype=np.float64)
+                except (TypeError, ValueError):
+                    self.meta[key] = value
+                    continue
+                array = array.ravel()
+                array.setflags(write=False)
+                self.columns[key] = array
+            else:
+                self.meta[key] = value
+
+    def column(self, name: str):
+        """ Function to get one column of the benchmark
+
+        Args:
+            name (str): the column name, e.g. "SPL(dB)"
+
+        Returns:
+            column (np.ndarray): the read-only column
+        """
+        return self.columns[name]
+
+    @property
+    def freq(self):
+        return self.columns.get("Freq(Hz)")
+
+    @property
+    def spl(self):
+        return self.columns.get("SPL(dB)")
+
+
+class BenchmarkStore():
+    def __init__(self, check_interval: float = 2.0):
+        """ Initializes an in-memory registry of benchmark files
+
+        Each file is read and parsed once. Later lookups are served from
+        memory, the file's mtime is looked at no more than once every
+        check_interval seconds and the file is re-read when it changed.
+
+        Args:
+            check_interval (float): seconds between mtime checks of a file
+
+        Returns:
+            N/A
+        """
+        self.check_interval = check_interval
+        self._benchmarks = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def load(self, filepath: str):
+        """ Function to get the benchmark stored in filepath
+
+        Args:
+            filepath (str): the benchmark file
+
+        Returns:
+            benchmark (Benchmark): the benchmark arrays
+        """
+        key = os.path.abspath(filepath)
+        now = time.monotonic()
+        with self._lock:
+            benchmark = self._benchmarks.get(key)
+            if benchmark is not None and \
+                    now - self._checked_at[key] < self.check_interval:
+                return benchmark
+        mtime = os.stat(key).st_mtime
+        if benchmark is None or benchmark.mtime != mtime:
+            with open(key) as f:
+                benchmark = Benchmark(key, json.load(f), mtime)
+        with self._lock:
+            self._benchmarks[key] = benchmark
+            self._checked_at[key] = now
+        return benchmark
+
+    def get(self, kind: str):
+        """ Function to get the benchmark of a mic/test type
+
+        Args:
+            kind (str): "vibration", "acoustic" or "stepped-sine"
+
+        Returns:
+            benchmark (Benchmark): the benchmark arrays
+        """
+        return self.load(BENCHMARK_FILES[kind])
+
+    def preload(self):
+        """ Function to load every known benchmark file that exists
+
+        Returns:
+            loaded (list): the kinds that were loaded
+        """
+        loaded = []
+        for kind, filepath in BENCHMARK_FILES.items():
+            if os.path.exists(filepath):
+                self.load(filepath)
+                loaded.append(kind)
+        return loaded
+
+    def clear(self):
+        """ Function to drop every loaded benchmark """
+        with self._lock:
+            self._benchmarks = {}
+            self._checked_at = {}
+
+
+_default_store = BenchmarkStore()
+
+
+def default_store():
+    """ Function to get the benchmark store shared by the whole process """
+    return _default_store
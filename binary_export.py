@@ -0,0 +1,168 @@
+import json
+import struct
+import numpy as np
+
+# file layout: MAGIC, version (uint16), reserved (uint16), header length
+# (uint32), the json header padded to 8 bytes, then every column as
+# little-endian float32 back to back. Offsets in the header are relative to
+# the end of the padded header.
+MAGIC = b"REWB"
+VERSION = 1
+BINARY_SUFFIX = ".rewb"
+COLUMN_DTYPE = "<f4"
+_PREAMBLE = struct.Struct("<4sHHI")
+_ALIGN = 8
+
+
+def is_binary_measurement(path):
+    """ Function to check if a file is a binary measurement container
+
+    Args:
+        path (str | Path): the file to check
+
+    Returns:
+        is_binary (bool): True if the file starts with the magic bytes
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _column_stats(values):
+    if values.size == 0:
+        return None, None
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return None, None
+    return float(finite.min()), float(finite.max())
+
+
+def write_measurement(file_path, columns: dict, header: dict = None):
+    """ Function to write a binary measurement container
+
+    The header keeps the same fields as the marimo json (filename,
+    'Meta Data', ...) and lists every column with its offset, length and
+    min/max, so indexing a file only has to read the header.
+
+    Args:
+        file_path (str | Path): where the file is written
+        columns (dict): column name, e.g. "Freq(Hz)", to values
+        header (dict | None): the non-array fields of the measurement
+
+    Returns:
+        file_path (str | Path): the path of the written file
+    """
+    header = dict(header or {})
+    arrays = []
+    layout = []
+    offset = 0
+    for name, values in columns.items():
+        array = np.ascontiguousarray(
+            np.asarray(values if values is not None else [],
+                       dtype=np.float64).ravel(), dtype=COLUMN_DTYPE)
+        low, high = _column_stats(array)
+        layout.append({
+            "name": name,
+            "dtype": COLUMN_DTYPE,
+            "offset": offset,
+            "count": int(array.size),
+            "min": low,
+            "max": high,
+        })
+        arrays.append(array)
+        offset += array.nbytes
+    header["columns"] = layout
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_offset = _PREAMBLE.size + len(header_bytes)
+    header_bytes += b" " * (-data_offset % _ALIGN)
+
+    with open(file_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        for array in arrays:
+            f.write(memoryview(array).cast("B"))
+    return file_path
+
+
+def _read_preamble(f, path):
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError(f"{path} is too short to be a binary measurement")
+    magic, version, _, header_length = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary measurement")
+    if version > VERSION:
+        raise ValueError(f"{path} has unsupported version {version}")
+    return header_length
+
+
+def read_header(path):
+    """ Function to read only the json header of a binary measurement
+
+    Args:
+        path (str | Path): the binary measurement file
+
+    Returns:
+        header (dict): the header, including the 'columns' layout
+    """
+    with open(path, "rb") as f:
+        header_length = _read_preamble(f, path)
+        return json.loads(f.read(header_length).decode("utf-8"))
+
+
+def read_measurement(path, mmap: bool = True):
+    """ Function to read a binary measurement in the marimo json schema
+
+    The columns are float32 views straight onto the file, with mmap they
+    are paged in by the OS on first access instead of being read up front.
+
+    Args:
+        path (str | Path): the binary measurement file
+        mmap (bool): memory-map the file, else read it into memory
+
+    Returns:
+        data (dict): the header fields plus one read-only array per column
+    """
+    with open(path, "rb") as f:
+        header_length = _read_preamble(f, path)
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    data_offset = _PREAMBLE.size + header_length
+    if mmap:
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        raw = np.fromfile(path, dtype=np.uint8)
+        raw.setflags(write=False)
+
+    data = {key: value for key, value in header.items() if key != "columns"}
+    for column in header.get("columns", []):
+        dtype = np.dtype(column.get("dtype", COLUMN_DTYPE))
+        start = data_offset + column["offset"]
+        stop = start + column["count"] * dtype.itemsize
+        data[column["name"]] = raw[start:stop].view(dtype)
+    return data
+
+
+def load_measurement(path, mmap: bool = True):
+    """ Function to load an exported measurement, json or binary
+
+    Args:
+        path (str | Path): the .json or binary measurement file
+        mmap (bool): memory-map binary files
+
+    Returns:
+        data (dict): the measurement in the marimo json schema
+    """
+    if is_binary_measurement(path):
+        return read_measurement(path, mmap=mmap)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    current_script_path = __file__
+    print(f'wrong file: {current_script_path}')
+    print("This file is not meant to be run directly.")
+    print("Please run the main script instead.")
@@ -1,13 +1,62 @@
 import base64
-import struct
-import json
-import jsonpickle
 import os
-import math
+from functools import lru_cache
+import numpy as np
 from project_paths import get_json_dir, get_stepped_sine_dir, ensure_data_dirs
+from pass_fail import engine_for, UNIT_TOLERANCES
+from benchmarks import BENCHMARK_FILES, default_store
+from resample import weights_for, same_grid
+from binary_export import write_measurement, BINARY_SUFFIX
+from json_stream import dump_file
+from distortion import DistortionTable, EXPORT_NAMES
+from smoothing import octave_fraction, octave_windows
+from batch_grading import BatchGrader
+
+
+@lru_cache(maxsize=64)
+def freq_axis(start_freq: float, freq_step: float = None, ppo: float = None,
+              length: int = 0):
+    """ Function to build a frequency axis once and share it
+
+    Linear when freq_step is given, otherwise log spaced at ppo points per
+    octave. Results are cached on the arguments and returned read-only, so
+    every measurement with the same axis gets the same array.
+
+    Args:
+        start_freq (float): the first frequency
+        freq_step (float | None): the step of a linear axis
+        ppo (float | None): points per octave of a log axis
+        length (int): the number of points
+
+    Returns:
+        freq_array (np.ndarray): the frequency axis, empty if it can't be
+                                 built
+    """
+    index = np.arange(length, dtype=np.float64)
+    if freq_step is not None:
+        freq_array = start_freq + index * freq_step
+    elif ppo is not None:
+        freq_array = start_freq * np.exp2(index / ppo)
+    else:
+        freq_array = np.empty(0, dtype=np.float64)
+    freq_array.setflags(write=False)
+    return freq_array
 
 
 class Data_Handling():
+    def __init__(self, benchmarks=None):
+        """ Initializes the data handling helper
+
+        Args:
+            benchmarks (BenchmarkStore | None): where benchmark files are
+                kept in memory, defaults to the store shared by the process
+
+        Returns:
+            N/A
+        """
+        self.benchmarks = benchmarks if benchmarks is not None \
+            else default_store()
+
     def sanitize_filename(self, name, replacement="_"):
         """Return a filesystem-safe filename (no path separators or reserved chars)."""
         if name is None:
@@ -22,81 +71,101 @@ class Data_Handling():
         safe = safe.strip().strip(".")
         return safe if safe else "untitled"
 
-    def decode_array(self, base64_encoded):
+    def decode_array(self, base64_encoded, as_list: bool = False,
+                     native: bool = False):
         """ Function to decode a base64 encoded array
 
+        By default the result is a read-only big-endian float32 numpy view
+        over the decoded bytes, so no Python float is made per sample.
+
         Args:
             base64_encoded (str): the base64 encoded array
+            as_list (bool): True returns a list of Python floats instead
+            native (bool): True returns a writable native float32 copy
 
         Returns:
-            readable_array (list): the decoded array
+            readable_array (np.ndarray | list): the decoded array
         """
         decoded_array = base64.b64decode(base64_encoded)
-        readable_array = self.byte_to_float_array(decoded_array)
+        readable_array = self.byte_to_float_array(decoded_array, native)
+        if as_list:
+            return readable_array.tolist()
         return readable_array
 
-    def byte_to_float_array(self, bytes_data):
+    def decode_distortion(self, response):
+        """ Function to decode a REW distortion response into a table
+
+        Args:
+            response (dict | list): the /distortion response or its rows
+
+        Returns:
+            table (DistortionTable): one row per stepped frequency, with
+                                     columns Freq, Fundamental, THD, THD+N,
+                                     N, Noise and H2 to H10
+        """
+        return DistortionTable.from_response(response)
+
+    def byte_to_float_array(self, bytes_data, native: bool = False):
         """ Function to convert a byte array to a float array
 
-        This little guy is big endian decoded
+        This little guy is big endian decoded. The array is a view over
+        bytes_data, read-only when bytes_data is immutable.
 
         Args:
-            bytes_data (list): the byte array to be converted
+            bytes_data (bytes): the byte array to be converted
+            native (bool): True returns a native-endian float32 copy
 
         Returns:
-            float_array (list): the converted float array
+            float_array (np.ndarray): the converted float array
         """
-        float_array = list(struct.unpack('>' + 'f' * (len(bytes_data) // 4),
-                                         bytes_data))
+        float_array = np.frombuffer(bytes_data, dtype='>f4',
+                                    count=len(bytes_data) // 4)
+        if native:
+            return float_array.astype(np.float32)
         return float_array
 
     def build_freq_array_from_response(self, response, length):
         """Build frequency array for a REW FrequencyResponse.
 
         Uses startFreq with either freqStep (linear) or ppo (log spaced).
-        The length should match the decoded magnitude array length.
+        The length should match the decoded magnitude array length. The
+        array is shared between calls with the same axis and is read-only.
         """
         if response is None or length is None or length <= 0:
-            return []
+            return freq_axis(0.0)
 
         start_freq = response.get("startFreq")
         freq_step = response.get("freqStep")
         ppo = response.get("ppo")
 
         if start_freq is None:
-            return []
+            return freq_axis(0.0)
 
         if freq_step is not None:
-            return [start_freq + i * freq_step for i in range(length)]
+            return freq_axis(float(start_freq), freq_step=float(freq_step),
+                             length=int(length))
 
         if ppo is not None:
-            ratio = math.exp(math.log(2.0) / ppo)
-            return [start_freq * (ratio ** i) for i in range(length)]
+            return freq_axis(float(start_freq), ppo=float(ppo),
+                             length=int(length))
 
-        return []
+        return freq_axis(0.0)
 
     # separate file
     def load_json_column(self, column: str = "SPL(dB)",
                          filepath: str = "benchmark"):
         """ Function to load the SPL data from a .json file
 
+        The file is parsed once and kept in memory by the benchmark store,
+        nested columns (the stepped sine benchmark) come back flattened.
+
         Args:
             filepath (str): the filepath of the .json file
 
         Returns:
-            float_array (list): the SPL data from the .json file
-        """
-        float_array = []
-        with open(filepath) as f:
-            data = json.load(f)
-            datcol = data[column]
-            if len(datcol) == 14 and isinstance(datcol, list) is True:
-                # this is a special case for the stepped sine benchmark:
-                for i in range(0, len(datcol), 1):
-                    float_array.extend((datcol[i]))
-            else:
-                float_array = [float(string) for string in data[column]]
-        return float_array
+            float_array (np.ndarray): the SPL data from the .json file
+        """
+        return self.benchmarks.load(filepath).column(column)
 
     # separate file
     def load_json_freq(self, filepath: str = "benchmark"):
@@ -106,12 +175,22 @@ class Data_Handling():
             filepath (str): the filepath of the .json file
 
         Returns:
-            float_array (list): the frequency data from the .json file
+            float_array (np.ndarray): the frequency data from the .json file
         """
-        with open(filepath) as f:
-            data = json.load(f)
-            float_array = [float(string) for string in data["Freq(Hz)"]]
-        return float_array
+        return self.load_json_column("Freq(Hz)", filepath)
+
+    def benchmark(self, filepath):
+        """ Function to get a whole benchmark from memory
+
+        Args:
+            filepath (int | str): the get_bmark case number or a filepath
+
+        Returns:
+            benchmark (Benchmark): the benchmark columns as arrays
+        """
+        if isinstance(filepath, int):
+            filepath = self.get_bmark(filepath)
+        return self.benchmarks.load(filepath)
 
     # separate file
     def list_dev_calc(self, bench_array, decoded_array):
@@ -127,13 +206,92 @@ class Data_Handling():
             decoded_array (list): the decoded data
 
         Returns:
-            diff_list (list): the deviation between the decoded and benchmark
-            data
+            diff_list (np.ndarray): the deviation between the decoded and
+            benchmark data, one value per benchmark sample
+        """
+        bench = np.asarray(bench_array, dtype=np.float64)
+        decoded = np.asarray(decoded_array, dtype=np.float64)
+        return bench - decoded[:bench.size]
+
+    def resample_to_grid(self, values, source_freq, target_freq):
+        """ Function to move a curve from one frequency grid onto another
+
+        Linear (freqStep) axes are interpolated in frequency and log (ppo)
+        axes in log-frequency. The interpolation weights of a pair of grids
+        are cached, so a batch of units on the same grids reuses them.
+
+        Args:
+            values (np.ndarray | list): the curve, one value per source bin
+            source_freq (np.ndarray | list): the frequency axis of values
+            target_freq (np.ndarray | list): the frequency axis wanted
+
+        Returns:
+            resampled (np.ndarray): the curve, one value per target bin
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if same_grid(source_freq, target_freq):
+            return values
+        return weights_for(source_freq, target_freq).apply(values)
+
+    def compare_to_benchmark(self, bench_array, bench_freq, decoded_array,
+                             decoded_freq):
+        """ Function to calculate the deviation on the benchmark's grid
+
+        Unlike list_dev_calc the two curves don't have to be sampled on the
+        same points, the measured curve is resampled onto the benchmark's
+        frequency axis first.
+
+        Args:
+            bench_array (np.ndarray | list): the benchmark data
+            bench_freq (np.ndarray | list): the benchmark frequency axis
+            decoded_array (np.ndarray | list): the decoded data
+            decoded_freq (np.ndarray | list): the decoded frequency axis
+                                              (build_freq_array_from_response)
+
+        Returns:
+            diff_list (np.ndarray): benchmark minus measured, one value per
+                                    benchmark sample
+        """
+        bench = np.asarray(bench_array, dtype=np.float64)
+        measured = self.resample_to_grid(decoded_array, decoded_freq,
+                                         bench_freq)
+        return bench - measured
+
+    def can_smooth_locally(self, smoothing):
+        """ Function to check if a smoothing choice can be done by smooth
+
+        Args:
+            smoothing (str | None): the REW smoothing choice, e.g. "1/12"
+
+        Returns:
+            local (bool): True for 1/N octave choices, False for no
+                          smoothing and for the choices only REW can do
+        """
+        return bool(octave_fraction(smoothing))
+
+    def smooth(self, spl_array, freq_array, smoothing):
+        """ Function to apply 1/N octave smoothing to an unsmoothed curve
+
+        Matches the fractional octave choices of
+        get_measurements_frequency_response_smoothing_choices. Each bin is
+        the power average of the bins within 1/N octave around it, worked
+        out from cumulative sums so a curve takes O(n) and the windows of a
+        grid are only searched for once.
+
+        Args:
+            spl_array (np.ndarray | list): the unsmoothed curve in dB
+            freq_array (np.ndarray | list): the frequency of every point
+            smoothing (str | None): the REW smoothing choice, e.g. "1/12"
+
+        Returns:
+            smoothed (np.ndarray): the smoothed curve in dB
         """
-        diff_list = []
-        for i in range(len(bench_array)):
-            diff_list.append(float(bench_array[i]) - float(decoded_array[i]))
-        return diff_list
+        fraction = octave_fraction(smoothing)
+        if fraction is None:
+            raise ValueError(f"smoothing {smoothing!r} is only done by REW")
+        if fraction == 0:
+            return np.asarray(spl_array, dtype=np.float64)
+        return octave_windows(freq_array, fraction).apply(spl_array)
 
     # separate file
     def list_abs_value(self, non_abs_array):
@@ -143,120 +301,193 @@ class Data_Handling():
             non_abs_array (list): the list to be converted to absolute values
 
         Returns:
-            abs_array (list): the absolute value of the list
+            abs_array (np.ndarray): the absolute value of the list
+
+        """
+        return np.abs(np.asarray(non_abs_array, dtype=np.float64))
+
+    def sweep_freq_array(self, length: int, start_freq: float = 2.1972656,
+                         freq_step: float = 0.36621097):
+        """ Function to get the frequency axis of the default 256k sweep
+
+        Used when a pass/fail check is not given the frequency axis of the
+        measurement.
+
+        Args:
+            length (int): the number of points
+            start_freq (float): the starting frequency of the SPL sweep
+            freq_step (float): the frequency step of the sweep
+
+        Returns:
+            freq_array (np.ndarray): the shared read-only frequency axis
+        """
+        return freq_axis(start_freq, freq_step=freq_step, length=int(length))
+
+    def evaluate_pass_fail(self, diff_list, freq_array=None,
+                           PFthreshold: float = 25.0,
+                           fail_count: int = 900,
+                           low_freq: float = 30.0,
+                           high_freq: float = 10000.0,
+                           min_length: int = 54000):
+        """ Function to judge a unit and report which bins failed
+
+        The evaluation band of the frequency grid is compiled into a mask
+        once per grid and reused, every unit is then one vectorized compare
+        and count.
+
+        Args:
+            diff_list (np.ndarray | list): benchmark minus measured data
+            freq_array (np.ndarray | None): frequency of every bin, the
+                                            default 256k sweep axis if None
+            PFthreshold (float): the threshold to be measured against
+            fail_count (int): the number of failures allowed before the
+                unit fails the P/F test
+            low_freq (float): lowest frequency that is checked
+            high_freq (float): highest frequency that is checked
+            min_length (int): the unit fails with fewer points than this
 
+        Returns:
+            result (PassFailResult): pass/fail, failure count and the
+                                     indices of the failing bins
         """
-        abs_array = [abs(element) for element in non_abs_array]
-        return abs_array
+        if freq_array is None:
+            freq_array = self.sweep_freq_array(len(diff_list))
+        engine = engine_for(freq_array, low_freq, high_freq)
+        return engine.evaluate(diff_list, PFthreshold, fail_count, min_length)
 
     # this might need to be moved to a separate file
     def unit_pass_fail(self, diff_list, PFthreshold: float = 25.0,
-                       fail_count: int = 900):
+                       fail_count: int = 900, freq_array=None):
         """ Function to check if any value in the SPL falls
             outside of the accepted range
 
-            reads in an array that has alreay been converted to absolute value.
-            Then checks each value against the set P/F threshold to see if the
-            unit has passed the test
+            Checks the absolute deviation of every point between 30 Hz and
+            10 kHz against the set P/F threshold to see if the unit has
+            passed the test
 
             to account for any random noise in the data, a specific
             number of failed tests is allowed before the unit
             fails the P/F test
 
-            fail_count is set to 540 because that is 1% of the 54000
-            values that exist in the array being checkeed
-
-        Variables:
-            PF (bool): True if the unit passes the P/F test, False if not
-            start_freq (float): the starting frequency of the SPL sweep
-            start_index (int): the index at which the sweep data
-                starts being useful for the P/F test
-            freq_step (float): the frequency step of the sweep
-            list_start (int): the index at which the sweep data
-                starts being useful for the P/F test
+            fail_count is set to 900, about 3% of the ~27000 points
+            between 30 Hz and 10 kHz
 
         Args:
-            abs_array (list): the list being checked
+            diff_list (list): the deviation from the benchmark
             PFthreshold (float): the threshold to be measured against
             fail_count (int): the number of failures allowed before the
                 unit fails the P/F test
+            freq_array (np.ndarray | None): frequency of every point, the
+                default 256k sweep axis if None
 
         Returns:
             PF (bool): True if the list is less than the threshold,
             False if not
 
         """
-        PF = True
-        len(diff_list)
-        start_freq = 2.1972656
-        start_index = 30
-        end_index = 10000
-        freq_step = 0.36621097
-        list_start = round((start_index-start_freq)/freq_step)
-        list_end = round((end_index-start_freq)/freq_step)
-        number_failed = 0
-        abs_list = self.list_abs_value(diff_list)
-        for i in range(len(abs_list[list_start:list_end])):
-            if abs_list[i] > PFthreshold:
-                number_failed += 1
-        if (number_failed > fail_count) or len(diff_list) < 54000:
-            PF = False
-        return PF
+        return self.evaluate_pass_fail(diff_list, freq_array, PFthreshold,
+                                       fail_count).passed
+
+    def get_tolerance_spec(self, unitType: str):
+        """ Function to get the tolerance mask of a unit type
+
+        Args:
+            unitType (str): the unit type name (e.g. "ResonX") or its
+                            letter (r/R, b/B, e/E, t/T)
+
+        Returns:
+            spec (ToleranceSpec): the tolerance mask of the unit type
+        """
+        letters = {"r": "ResonX", "b": "Bass Shaker", "e": "Exciter",
+                   "t": "Thruster"}
+        name = letters.get(str(unitType).strip().lower(), unitType)
+        if name not in UNIT_TOLERANCES:
+            raise ValueError(f"No tolerance mask for unit type {unitType!r}")
+        return UNIT_TOLERANCES[name]
+
+    def tolerance_pass_fail(self, measured_array, bench_array, unitType: str,
+                            freq_array=None):
+        """ Function to judge a unit against the mask of its unit type
+
+        The mask is compiled into upper/lower limit arrays once per
+        frequency grid, so each unit is one vectorized comparison.
+
+        Args:
+            measured_array (np.ndarray | list): the measured SPL data
+            bench_array (np.ndarray | list): the benchmark on the same grid
+            unitType (str): the unit type name or letter
+            freq_array (np.ndarray | None): frequency of every point, the
+                default 256k sweep axis if None
+
+        Returns:
+            result (ToleranceResult): pass/fail and failures per band
+        """
+        if freq_array is None:
+            freq_array = self.sweep_freq_array(len(bench_array))
+        limits = self.get_tolerance_spec(unitType).compile(freq_array)
+        return limits.judge(measured_array, bench_array)
+
+    def batch_pass_fail(self, curves, bench_array, freq_array=None,
+                        unitType: str = None, ids=None, source_freq=None,
+                        chunk_size: int = 128):
+        """ Function to re-grade many units against one benchmark at once
+
+        The curves are judged chunk_size at a time as one (units, bins)
+        matrix, so memory stays bounded however many units are graded.
+
+        Args:
+            curves (iterable | np.ndarray): measured curves in dB, one per
+                                            unit, or a 2-D array
+            bench_array (np.ndarray | list): the benchmark curve
+            freq_array (np.ndarray | None): the benchmark frequency axis,
+                the default 256k sweep axis if None
+            unitType (str | None): judge with the mask of this unit type,
+                the unit_pass_fail check if None
+            ids (iterable | None): an id for every curve
+            source_freq (np.ndarray | None): the grid of the curves if it
+                isn't the benchmark's
+            chunk_size (int): units judged per chunk
+
+        Returns:
+            result (BatchResult): pass/fail and failures for every unit
+        """
+        if freq_array is None:
+            freq_array = self.sweep_freq_array(len(bench_array))
+        spec = None if unitType is None else self.get_tolerance_spec(unitType)
+        grader = BatchGrader(bench_array, freq_array, spec=spec,
+                             chunk_size=chunk_size)
+        return grader.grade(curves, ids=ids, source_freq=source_freq)
 
     # functions below this line are not used in the current version of the
     # code but are left in for future use
 
     def stepped_sine_pass_fail(self, diff_list, PFthreshold: float = 25.0,
-                               fail_count: int = 900):
+                               fail_count: int = 900, freq_array=None):
         """This function is used to check if any value in the SPL falls
             outside of the accepted range for the stepped sine sweep test
 
-            reads in an array that has alreay been converted to absolute value.
-            Then checks each value against the set P/F threshold to see if the
-            unit has passed the test
+            Checks the absolute deviation of every point between 30 Hz and
+            10 kHz against the set P/F threshold to see if the unit has
+            passed the test
 
             to account for any random noise in the data, a specific
             number of failed tests is allowed before the unit
             fails the P/F test
 
-            fail_count is set to 540 because that is 1% of the 54000
-            values that exist in the array being checkeed
-
-            Variables:
-                PF (bool): True if the unit passes the P/F test, False if not
-                start_freq (float): the starting frequency of the SPL sweep
-                start_index (int): the index at which the sweep data
-                    starts being useful for the P/F test
-                freq_step (float): the frequency step of the sweep
-                list_start (int): the index at which the sweep data
-                    starts being useful for the P/F test
-
         Args:
-            abs_array (list): the list being checked
+            diff_list (list): the deviation from the benchmark
             PFthreshold (float): the threshold to be measured against
             fail_count (int): the number of failures allowed before the
                 unit fails the P/F test
+            freq_array (np.ndarray | None): frequency of every point, the
+                default 256k sweep axis if None
 
         Returns:
             PF (bool): True if the list is less than the threshold,
             False if not
         """
-        PF = True
-        len(diff_list)
-        start_freq = 2.1972656
-        start_index = 30
-        end_index = 10000
-        freq_step = 0.36621097
-        list_start = round((start_index-start_freq)/freq_step)
-        list_end = round((end_index-start_freq)/freq_step)
-        number_failed = 0
-        abs_list = self.list_abs_value(diff_list)
-        for i in range(len(abs_list[list_start:list_end])):
-            if abs_list[i] > PFthreshold:
-                number_failed += 1
-        if (number_failed > fail_count) or (len(diff_list) < 54000):
-            PF = False
-        return PF
+        return self.evaluate_pass_fail(diff_list, freq_array, PFthreshold,
+                                       fail_count).passed
 
     def get_measure_sweep_configuration(self):
         """ Function to get the current sweep configuration
@@ -321,13 +552,13 @@ class Data_Handling():
         """
         match filepath:
             case 1:
-                filepath = "./benchmarks/benchmark-vibration.json"
+                filepath = BENCHMARK_FILES["vibration"]
             case 2:
-                filepath = "./benchmarks/benchmark-acoustic.json"
+                filepath = BENCHMARK_FILES["acoustic"]
             case 3:
-                filepath = "./benchmarks/stepped-sine benchmark.json"
+                filepath = BENCHMARK_FILES["stepped-sine"]
             case 4:
-                filepath = "./benchmarks/stepped-sine benchmark.json"
+                filepath = BENCHMARK_FILES["stepped-sine"]
             case _:
                 print("Filepath not found")
         return filepath
@@ -365,7 +596,7 @@ class Data_Handling():
         return unitType
 
     def make_json(self, name, freq_array, decoded_array, measurements, i,
-                  filepath: str = None):
+                  filepath: str = None, compact: bool = False):
         """ Function to make a .json file from the decoded data
 
         Args:
@@ -373,6 +604,7 @@ class Data_Handling():
             freq_array (list): the frequency data
             decoded_array (list): the decoded data for SPL data
             filepath (str): the filepath of the .json file
+            compact (bool): write without indentation
 
         Returns:
             N/A
@@ -397,90 +629,100 @@ class Data_Handling():
         out_dir = get_json_dir() if filepath is None else filepath
         safe_name = self.sanitize_filename(name)
         file_path = os.path.join(str(out_dir), f"{safe_name}.json")
-        with open(file_path, 'w') as outFile:
-            json.dump(outDict, outFile, indent=4)
+        dump_file(outDict, file_path, indent=None if compact else 4)
         return
 
     def make_stepped_json(self, name, dist_data, measurements, i,
-                          filepath: str = None):
+                          filepath: str = None, compact: bool = False):
         """This function is used to make a .json file from the decoded data
         for stepped sine sweep measurements
         Args:
             name (str): the name of the measurement given by user
-            decoded_data (list): the decoded data for SPL data
+            dist_data (DistortionTable | list): the decoded distortion
+                table, or its rows flattened one after the other
             filepath (str): the filepath of the .json file
+            compact (bool): write without indentation
         Returns:
             N/A
         """
         mea = measurements
+        if not isinstance(dist_data, DistortionTable):
+            dist_data = DistortionTable.from_flat(dist_data)
         # have like for loop checking for all the data pieces in measurements
         # add the data pieces to a temp meta dict
         # then add the temp meta dict to the outDict
-        outDict = {
-                    "filename": name,
-                    "Freq(Hz)": dist_data[0::15],
-                    "Fundamental (dB)": dist_data[1::15],
-                    "THD(%)": dist_data[2::15],
-                    "THD+N(%)": dist_data[3::15],
-                    "N(%)": dist_data[4::15],
-                    "Noise (%)": dist_data[5::15],
-                    "H2 (%)": dist_data[6::15],
-                    "H3 (%)": dist_data[7::15],
-                    "H4 (%)": dist_data[8::15],
-                    "H5 (%)": dist_data[9::15],
-                    "H6 (%)": dist_data[10::15],
-                    "H7 (%)": dist_data[11::15],
-                    "H8 (%)": dist_data[12::15],
-                    "H9 (%)": dist_data[13::15],
-                    "H10 (%)": dist_data[14::15],
-                    "Meta Data": {
-                                    "Measurement": mea[i]["title"],
-                                    "Notes": mea[i]["notes"],
-                                    "Date": mea[i]["date"],
-                                    "uuid": mea[i]["uuid"],
-                                    "rew version": mea[i]["rewVersion"],
-                                    "Start Frequency": mea[i]["startFreq"],
-                                    "End Frequency": mea[i]["endFreq"],
-                                    }
-                    }
+        outDict = {"filename": name}
+        # column views, the table is not copied before it is written
+        for field in dist_data.fields:
+            outDict[EXPORT_NAMES.get(field, field)] = dist_data.column(field)
+        outDict["Meta Data"] = {
+            "Measurement": mea[i]["title"],
+            "Notes": mea[i]["notes"],
+            "Date": mea[i]["date"],
+            "uuid": mea[i]["uuid"],
+            "rew version": mea[i]["rewVersion"],
+            "Start Frequency": mea[i]["startFreq"],
+            "End Frequency": mea[i]["endFreq"],
+        }
         ensure_data_dirs()
         out_dir = get_stepped_sine_dir() if filepath is None else filepath
         safe_name = self.sanitize_filename(name)
         file_path = os.path.join(str(out_dir), f"{safe_name}.json")
-        with open(file_path, 'w') as outFile:
-            json.dump(outDict, outFile, indent=4)
+        dump_file(outDict, file_path, indent=None if compact else 4)
         return
 
+    def marimo_header(self, filename, measurement, smoothing=None):
+        """ Function to make the non-array fields of a marimo export
+
+        Args:
+            filename (str): the name of the export
+            measurement (dict): the measurement from /measurements
+            smoothing (str | None): the smoothing applied to the response
+
+        Returns:
+            header (dict): 'filename' and 'Meta Data' of the export
+        """
+        mea = measurement
+        return {
+                "filename": filename,
+                "Meta Data": {
+                                "REW Version": mea["rewVersion"],
+                                "Dated": mea["date"],
+                                "UUID": mea["uuid"],
+                                "notes": mea["notes"],
+                                "Measurement": mea["title"],
+                                "Start Frequency": mea["startFreq"],
+                                "End Frequency": mea["endFreq"],
+                                "Smoothing": smoothing,
+                                }
+                }
+
     def make_marimo_json(self, filename, measurement, decoded_array,
                          freq_array=None,
                          smoothing=None,
-                         filepath: str = None):
+                         filepath: str = None,
+                         compact: bool = False):
         """ Function to make a .json file from the decoded data
 
+        The arrays are streamed to the file in chunks (see json_stream)
+        rather than turned into lists and one big string first.
+
         Args:
             name (str): the name of the measurement given by user
             freq_array (list): the frequency data
             decoded_array (list): the decoded data for SPL data
             filepath (str): the filepath of the .json file
+            compact (bool): write without indentation
 
         Returns:
-            N/A
+            file_path (str): the path of the written .json file
         """
-        mea = measurement
+        header = self.marimo_header(filename, measurement, smoothing)
         outDict = {
-                    "filename": filename,
+                    "filename": header["filename"],
                     "Freq(Hz)": freq_array,
                     "SPL(dB)": decoded_array,
-                    "Meta Data": {
-                                    "REW Version": mea["rewVersion"],
-                                    "Dated": mea["date"],
-                                    "UUID": mea["uuid"],
-                                    "notes": mea["notes"],
-                                    "Measurement": mea["title"],
-                                    "Start Frequency": mea["startFreq"],
-                                    "End Frequency": mea["endFreq"],
-                                    "Smoothing": smoothing,
-                                    }
+                    "Meta Data": header["Meta Data"],
                     }
 
         ensure_data_dirs()
@@ -488,12 +730,77 @@ class Data_Handling():
         safe_name = self.sanitize_filename(filename)
         file_path = os.path.join(str(out_dir), f"{safe_name}.json")
 
-        with open(file_path, 'w') as outFile:
-            outFile.write(
-                jsonpickle.encode(outDict, indent=4)
-            )
+        dump_file(outDict, file_path, indent=None if compact else 4)
         print(f"writing to: {filepath}")
-        return
+        return file_path
+
+    def make_marimo_binary(self, filename, measurement, decoded_array,
+                           freq_array=None,
+                           smoothing=None,
+                           filepath: str = None):
+        """ Function to make a binary measurement file from the decoded data
+
+        Same content as make_marimo_json, but the frequency and SPL columns
+        are stored as float32 behind a small json header (see
+        binary_export), so nothing has to be formatted as text and the
+        columns can be memory-mapped when read back.
+
+        Args:
+            filename (str): the name of the measurement given by user
+            measurement (dict): the measurement from /measurements
+            decoded_array (np.ndarray | list): the decoded SPL data
+            freq_array (np.ndarray | list): the frequency data
+            smoothing (str | None): the smoothing applied to the response
+            filepath (str): the output folder, defaults to the json folder
+
+        Returns:
+            file_path (str): the path of the written file
+        """
+        header = self.marimo_header(filename, measurement, smoothing)
+
+        ensure_data_dirs()
+        out_dir = get_json_dir() if filepath is None else filepath
+        safe_name = self.sanitize_filename(filename)
+        file_path = os.path.join(str(out_dir), f"{safe_name}{BINARY_SUFFIX}")
+        write_measurement(file_path,
+                          {"Freq(Hz)": freq_array, "SPL(dB)": decoded_array},
+                          header)
+        return file_path
+
+    def write_record(self, record, filename: str = None, filepath: str = None,
+                     export_format: str = "json", compact: bool = False):
+        """ Function to export a MeasurementRecord with its curves attached
+
+        The record is only turned into the marimo schema here (see
+        MeasurementRecord.to_json), its float32 curves are written as they
+        are.
+
+        Args:
+            record (MeasurementRecord): the record, see set_curve
+            filename (str | None): the name of the export, the title if None
+            filepath (str): the output folder, defaults to the json folder
+            export_format (str): "json" or "binary" (.rewb)
+            compact (bool): write the json without indentation
+
+        Returns:
+            file_path (str): the path of the written file
+        """
+        data = record.to_json(filename)
+        ensure_data_dirs()
+        out_dir = get_json_dir() if filepath is None else filepath
+        safe_name = self.sanitize_filename(data["filename"])
+        if export_format == "json":
+            file_path = os.path.join(str(out_dir), f"{safe_name}.json")
+            dump_file(data, file_path, indent=None if compact else 4)
+        elif export_format == "binary":
+            file_path = os.path.join(str(out_dir),
+                                     f"{safe_name}{BINARY_SUFFIX}")
+            columns = {"Freq(Hz)": data.pop("Freq(Hz)"),
+                       "SPL(dB)": data.pop("SPL(dB)")}
+            write_measurement(file_path, columns, data)
+        else:
+            raise ValueError(f"unknown export format: {export_format}")
+        return file_path
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import warnings
+import numpy as np
+
+# columns of a REW /distortion table in the order REW sends them
+DISTORTION_FIELDS = ("Freq", "Fundamental", "THD", "THD+N", "N", "Noise",
+                     "H2", "H3", "H4", "H5", "H6", "H7", "H8", "H9", "H10")
+
+# the key each column is written under by Data_Handling.make_stepped_json
+EXPORT_NAMES = {
+    "Freq": "Freq(Hz)",
+    "Fundamental": "Fundamental (dB)",
+    "THD": "THD(%)",
+    "THD+N": "THD+N(%)",
+    "N": "N(%)",
+    "Noise": "Noise (%)",
+    "H2": "H2 (%)",
+    "H3": "H3 (%)",
+    "H4": "H4 (%)",
+    "H5": "H5 (%)",
+    "H6": "H6 (%)",
+    "H7": "H7 (%)",
+    "H8": "H8 (%)",
+    "H9": "H9 (%)",
+    "H10": "H10 (%)",
+}
+
+
+def field_name(header: str):
+    """ Function to get the field name of a REW column header
+
+    Args:
+        header (str): the column header, e.g. "THD+N (%)"
+
+    Returns:
+        field (str): the header without its unit, e.g. "THD+N"
+    """
+    return str(header).split("(", 1)[0].strip()
+
+
+def positional_fields(width: int):
+    """ Function to get the field names of a table with width columns
+
+    Args:
+        width (int): the number of columns
+
+    Returns:
+        fields (tuple): DISTORTION_FIELDS in order, columns past those are
+                        named "Column<n>" (1-based)
+    """
+    extra = tuple(f"Column{index + 1}"
+                  for index in range(len(DISTORTION_FIELDS), width))
+    return DISTORTION_FIELDS[:width] + extra
+
+
+def check_headers(headers, fields):
+    """ Function to warn when REW's column headers aren't the expected ones
+
+    Args:
+        headers (list): the columnHeaders of a /distortion response
+        fields (tuple): the field name given to every column
+
+    Returns:
+        matches (bool): True if every header names its column's field
+    """
+    names = tuple(field_name(header) for header in headers)
+    if names == tuple(fields):
+        return True
+    warnings.warn(f"distortion columnHeaders {list(headers)} don't match "
+                  f"the expected fields {list(fields)}, columns are named "
+                  "by position", stacklevel=3)
+    return False
+
+
+class DistortionTable():
+    def __init__(self, data, fields=DISTORTION_FIELDS):
+        """ Initializes a decoded distortion table
+
+        The table is one C-contiguous (rows, columns) float64 array. Every
+        column is a strided view into it and flat is the row-major view that
+        lines up with the flattened stepped sine benchmark, so none of them
+        copy the data.
+
+        Args:
+            data (np.ndarray): the table, one row per stepped frequency
+            fields (tuple): the field name of every column
+
+        Returns:
+            N/A
+        """
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+        if self.data.ndim != 2:
+            self.data = self.data.reshape(-1, len(fields))
+        self.data.setflags(write=False)
+        self.fields = tuple(fields)
+        self._index = {field: index for index, field in enumerate(self.fields)}
+
+    @classmethod
+    def from_response(cls, response):
+        """ Function to decode a REW /distortion response
+
+        Columns are named by position from DISTORTION_FIELDS, as the
+        exported json keys must not depend on how REW spells its headers.
+        The columnHeaders are only checked against those names, a header
+        that doesn't match gives a warning.
+
+        Args:
+            response (dict | list): the response, or only its 'data' rows
+
+        Returns:
+            table (DistortionTable): the decoded table
+        """
+        headers = None
+        rows = response
+        if isinstance(response, dict):
+            headers = response.get("columnHeaders")
+            rows = response.get("data", [])
+        if not rows:
+            width = len(headers) if headers else len(DISTORTION_FIELDS)
+            return cls(np.empty((0, width)), positional_fields(width))
+        try:
+            data = np.array(rows, dtype=np.float64)
+        except ValueError:
+            # ragged rows, the missing cells are left as NaN
+            width = max(len(row) for row in rows)
+            data = np.full((len(rows), width), np.nan)
+            for index, row in enumerate(rows):
+                data[index, :len(row)] = row
+        fields = positional_fields(data.shape[1])
+        if headers:
+            check_headers(headers, fields)
+        return cls(data, fields)
+
+    @classmethod
+    def from_flat(cls, values, fields=DISTORTION_FIELDS):
+        """ Function to rebuild a table from flattened rows
+
+        Args:
+            values (np.ndarray | list): the rows one after the other
+            fields (tuple): the field name of every column
+
+        Returns:
+            table (DistortionTable): the table
+        """
+        flat = np.asarray(values, dtype=np.float64)
+        return cls(flat.reshape(-1, len(fields)), fields)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def column(self, field: str):
+        """ Function to get one column as a view
+
+        Args:
+            field (str): the field name, e.g. "THD" or "H3"
+
+        Returns:
+            column (np.ndarray): the read-only column view
+        """
+        return self.data[:, self._index[field]]
+
+    def columns(self):
+        """ Function to get every column as a view, keyed by field name """
+        return {field: self.column(field) for field in self.fields}
+
+    @property
+    def freq(self):
+        return self.column("Freq")
+
+    @property
+    def flat(self):
+        return self.data.reshape(-1)
+
+    @property
+    def records(self):
+        """ The table as a record array with one named field per column """
+        dtype = np.dtype([(field, np.float64) for field in self.fields])
+        return self.data.view(dtype).reshape(-1).view(np.recarray)
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from binary_export import load_measurement
+from response_cache import ResponseCache
+
+
+def log_bucket_minmax(freq_array, values, buckets: int = 1000):
+    """ Function to shrink a curve for a log-frequency plot
+
+    The frequency range is split into buckets of equal width on a log axis,
+    about one per pixel column, and only the lowest and highest point of
+    every bucket are kept (in their original order). Peaks and notches
+    survive exactly, where a bucket has one or two points nothing changes.
+
+    Args:
+        freq_array (np.ndarray | list): the frequency of every point,
+                                        ascending
+        values (np.ndarray | list): the curve, e.g. SPL in dB
+        buckets (int): log-frequency buckets, the plot width in pixels
+
+    Returns:
+        (freq, values) (np.ndarray, np.ndarray): at most 2 * buckets points
+    """
+    freq = np.asarray(freq_array, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    size = min(freq.size, values.size)
+    freq = freq[:size]
+    values = values[:size]
+    if size <= 2 * buckets:
+        return freq, values
+
+    # a log axis can't show 0 Hz, such points share the lowest bucket
+    floor = freq[freq > 0].min(initial=np.inf)
+    if not np.isfinite(floor):
+        return freq, values
+    log_freq = np.log(np.maximum(freq, floor))
+    width = (log_freq[-1] - log_freq[0]) / buckets or 1.0
+    bucket = np.minimum(((log_freq - log_freq[0]) / width).astype(np.int64),
+                        buckets - 1)
+
+    # frequency is ascending, so every bucket is one run of points
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    run = np.repeat(np.arange(starts.size), np.diff(np.r_[starts, size]))
+    with np.errstate(invalid="ignore"):
+        lowest = np.fmin.reduceat(values, starts)
+        highest = np.fmax.reduceat(values, starts)
+    # the first point of each run at the run's min / max, runs that are
+    # all NaN keep their first point
+    index = np.arange(size)
+    low_index = np.minimum.reduceat(
+        np.where(values == lowest[run], index, size), starts)
+    high_index = np.minimum.reduceat(
+        np.where(values == highest[run], index, size), starts)
+    low_index = np.where(low_index == size, starts, low_index)
+    high_index = np.where(high_index == size, starts, high_index)
+
+    keep = np.unique(np.concatenate(([0, size - 1], low_index, high_index)))
+    return freq[keep], values[keep]
+
+
+def file_key(path, checksum: str = None):
+    """ Function to get the cache key of a measurement file
+
+    Args:
+        path (str | Path): the measurement file
+        checksum (str | None): its sha256 from the database, if known
+
+    Returns:
+        key (tuple): the checksum, or the path, size and mtime without one
+    """
+    if checksum:
+        return ("sha256", checksum)
+    stat = os.stat(path)
+    return ("file", os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+class PlotCurveCache():
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """ Initializes a cache of downsampled curves ready to plot
+
+        Curves are keyed by file checksum and bucket count, a file that was
+        plotted before is drawn again without being read or reduced.
+
+        Args:
+            max_bytes (int): the max size of all cached curves
+
+        Returns:
+            N/A
+        """
+        self.cache = ResponseCache(max_bytes)
+
+    def load(self, path, checksum: str = None, buckets: int = 1000):
+        """ Function to get the downsampled curve of a measurement file
+
+        Args:
+            path (str | Path): the .json or .rewb measurement file
+            checksum (str | None): its sha256 from the database, if known
+            buckets (int): log-frequency buckets, the plot width in pixels
+
+        Returns:
+            curve (dict): 'filename', 'freq', 'spl' and 'points', the
+                          number of points in the file
+        """
+        key = file_key(path, checksum) + (buckets,)
+        curve = self.cache.get(key)
+        if curve is None:
+            data = load_measurement(path)
+            spl = data.get("SPL(dB)", [])
+            freq, spl = log_bucket_minmax(data.get("Freq(Hz)", []), spl,
+                                          buckets)
+            curve = {
+                "filename": data.get("filename", ""),
+                "freq": freq,
+                "spl": spl,
+                "points": len(data.get("SPL(dB)", [])),
+            }
+            self.cache.put(key, curve)
+        return curve
+
+    def load_many(self, files, buckets: int = 1000, max_workers: int = 8):
+        """ Function to get the downsampled curves of many files at once
+
+        Files that aren't cached are read and reduced on max_workers
+        threads. Files that can't be read are left out and listed in errors.
+
+        Args:
+            files (list): (path, checksum) pairs, checksum may be None
+            buckets (int): log-frequency buckets, the plot width in pixels
+            max_workers (int): files read at the same time
+
+        Returns:
+            (curves, errors) (list, dict): the curves in the order of files
+                                           and the exception per failed path
+        """
+        def load(item):
+            path, checksum = item
+            try:
+                return self.load(path, checksum, buckets), None
+            except (OSError, ValueError, KeyError) as exc:
+                return None, exc
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(load, files))
+        curves = []
+        errors = {}
+        for (path, _), (curve, exc) in zip(files, results):
+            if exc is None:
+                curves.append(curve)
+            else:
+                errors[str(path)] = exc
+        return curves, errors
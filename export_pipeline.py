@@ -0,0 +1,198 @@
+import threading
+import time
+from datetime import datetime
+from queue import Queue
+from measurement_record import MeasurementRecord
+
+_STOP = object()
+
+
+class ExportPipeline():
+    def __init__(self, rew, dataH,
+                 fetch_workers: int = 4,
+                 build_workers: int = 2,
+                 write_workers: int = 2,
+                 queue_size: int = 8):
+        """ Initializes the bulk frequency-response export pipeline
+
+        The export is split into three stages that run at the same time:
+        fetch (HTTP GET of the frequency response), build (decode the
+        magnitude array and build the frequency axis) and write (make the
+        marimo json). The stages are connected by bounded queues so a slow
+        stage holds back the ones in front of it instead of piling up
+        responses in memory.
+
+        Args:
+            rew (REWAutomation): the REW API client used to fetch responses
+            dataH (Data_Handling): the data handling helper
+            fetch_workers (int): number of threads fetching from REW
+            build_workers (int): number of threads decoding responses
+            write_workers (int): number of threads writing json files
+            queue_size (int): max items waiting between two stages
+
+        Returns:
+            N/A
+        """
+        self.rew = rew
+        self.dataH = dataH
+        self.fetch_workers = fetch_workers
+        self.build_workers = build_workers
+        self.write_workers = write_workers
+        self.queue_size = queue_size
+
+    def run(self, measurements: dict, filepath: str = None, smoothing=None,
+            progress=None, export_format: str = "json"):
+        """ Function to export every measurement in measurements as json
+
+        Files are named `YYYYMMDD_HHMMSS__ID<id>__<title>.json`, the same as
+        the notebook export, or `.rewb` for the binary format. The progress
+        callback is called from the thread that called run(), so it is safe
+        to update notebook widgets from it. MeasurementRecords get the
+        decoded curves attached (set_curve), plain entries are turned into
+        records for the write.
+
+        Args:
+            measurements (dict): the /measurements response or
+                                 MeasurementRecords, keyed by id
+            filepath (str): the output folder, defaults to the json folder
+            smoothing (str | None): smoothing option passed to REW
+            progress (callable | None): called as progress(done, total, id)
+                                        after each measurement finishes
+            export_format (str): "json" or "binary", see
+                                 Data_Handling.write_record
+
+        Returns:
+            result (dict): 'exported' (list of file paths), 'errors' (dict of
+                           id to exception), 'timings' (per stage) and
+                           'wall_seconds'
+        """
+        if export_format not in ("json", "binary"):
+            raise ValueError(f"unknown export format: {export_format}")
+        items = [(str(meas_id), meas) for meas_id, meas in measurements.items()]
+        total = len(items)
+        timings = {stage: {"items": 0, "busy_seconds": 0.0}
+                   for stage in ("fetch", "build", "write")}
+        timing_lock = threading.Lock()
+
+        fetch_q = Queue()
+        build_q = Queue(maxsize=self.queue_size)
+        write_q = Queue(maxsize=self.queue_size)
+        done_q = Queue()
+        for item in items:
+            fetch_q.put(item)
+
+        def fetch(item):
+            meas_id, meas = item
+            response = self.rew.get_measurements_id_freq_response(
+                meas_id, smoothing=smoothing)
+            return meas_id, meas, response
+
+        def build(item):
+            meas_id, meas, response = item
+            decoded_array = self.dataH.decode_array(response["magnitude"])
+            freq_array = self.dataH.build_freq_array_from_response(
+                response, len(decoded_array))
+            used_smoothing = smoothing
+            if used_smoothing is None and isinstance(response, dict):
+                used_smoothing = response.get("smoothing")
+            record = meas
+            if not isinstance(record, MeasurementRecord):
+                record = MeasurementRecord.from_rew(meas_id, meas)
+            record.set_curve(freq_array, decoded_array, used_smoothing)
+            return meas_id, record
+
+        def write(item):
+            meas_id, record = item
+            title = record.get("title", f"measurement_{meas_id}")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            export_name = self.dataH.sanitize_filename(
+                f"{timestamp}__ID{meas_id}__{title}")
+            file_path = self.dataH.write_record(
+                record,
+                export_name,
+                filepath=filepath,
+                export_format=export_format,
+            )
+            return meas_id, file_path
+
+        stages = [
+            ("fetch", fetch, fetch_q, build_q, self.fetch_workers),
+            ("build", build, build_q, write_q, self.build_workers),
+            ("write", write, write_q, done_q, self.write_workers),
+        ]
+        # each stage gets one stop marker per worker from the stage before it
+        for _ in range(self.fetch_workers):
+            fetch_q.put(_STOP)
+
+        threads = []
+        for index, (name, func, in_q, out_q, workers) in enumerate(stages):
+            next_workers = (stages[index + 1][4]
+                            if index + 1 < len(stages) else 0)
+            live = [workers]
+            live_lock = threading.Lock()
+
+            def worker(name=name, func=func, in_q=in_q, out_q=out_q,
+                       next_workers=next_workers, live=live,
+                       live_lock=live_lock):
+                while True:
+                    item = in_q.get()
+                    if item is _STOP:
+                        break
+                    start = time.perf_counter()
+                    try:
+                        result = func(item)
+                    except Exception as exc:
+                        done_q.put(("error", item[0], exc))
+                        continue
+                    finally:
+                        with timing_lock:
+                            timings[name]["items"] += 1
+                            timings[name]["busy_seconds"] += (
+                                time.perf_counter() - start)
+                    if name == "write":
+                        done_q.put(("done",) + result)
+                    else:
+                        out_q.put(result)
+                with live_lock:
+                    live[0] -= 1
+                    if live[0] == 0:
+                        for _ in range(next_workers):
+                            out_q.put(_STOP)
+
+            for _ in range(workers):
+                thread = threading.Thread(target=worker, daemon=True,
+                                          name=f"export-{name}")
+                thread.start()
+                threads.append(thread)
+
+        exported = []
+        errors = {}
+        wall_start = time.perf_counter()
+        for done in range(1, total + 1):
+            status, meas_id, payload = done_q.get()
+            if status == "done":
+                exported.append(payload)
+            else:
+                errors[meas_id] = payload
+            if progress is not None:
+                progress(done, total, meas_id)
+        for thread in threads:
+            thread.join()
+
+        for stage in timings.values():
+            count = stage["items"]
+            stage["mean_ms"] = (1000.0 * stage["busy_seconds"] / count
+                                if count else 0.0)
+        return {
+            "exported": exported,
+            "errors": errors,
+            "timings": timings,
+            "wall_seconds": time.perf_counter() - wall_start,
+        }
+
+
+if __name__ == "__main__":
+    current_script_path = __file__
+    print(f'wrong file: {current_script_path}')
+    print("This file is not meant to be run directly.")
+    print("Please run the main script instead.")
@@ -8,6 +8,7 @@ from datetime import datetime
 import shutil
 
 from project_paths import get_data_root, get_mdat_dir, get_json_dir
+from binary_export import BINARY_SUFFIX, is_binary_measurement, read_header
 
 
 def get_db_conn():
@@ -90,8 +91,18 @@ def parse_timestamp(value):
 
 
 def parse_measurement_json(path, relative_path=None):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # binary exports carry min/max/count of every column in their header,
+    # so only the header is read and the columns are never touched
+    column_stats = {}
+    if is_binary_measurement(path):
+        data = read_header(path)
+        for column in data.get("columns", []):
+            if column.get("count"):
+                column_stats[column["name"]] = (
+                    column.get("min"), column.get("max"), column["count"])
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     meta = data.get("Meta Data", {}) if isinstance(data, dict) else {}
     measurement_title = meta.get("Measurement") or data.get("filename")
@@ -123,8 +134,10 @@ def parse_measurement_json(path, relative_path=None):
             return None, None, None
         return min(float_values), max(float_values), len(float_values)
 
-    freq_min, freq_max, freq_count = _summary(freq_values)
-    spl_min, spl_max, spl_count = _summary(spl_values)
+    freq_min, freq_max, freq_count = (column_stats.get("Freq(Hz)")
+                                      or _summary(freq_values))
+    spl_min, spl_max, spl_count = (column_stats.get("SPL(dB)")
+                                   or _summary(spl_values))
 
     return {
         "id": measurement_id,
@@ -218,15 +231,17 @@ def import_files(
                         ("mdat", host_id, relative_path, path.stat().st_size, checksum),
                     )
 
-            # JSON files
-            for path in iter_files(json_dir, "**/*.json"):
+            # JSON and binary measurement files
+            measurement_paths = (iter_files(json_dir, "**/*.json")
+                                 + iter_files(json_dir, f"**/*{BINARY_SUFFIX}"))
+            for path in measurement_paths:
                 relative_path = str(path.relative_to(data_root)).replace("\\", "/")
                 if copy_root and copy_root != data_root:
                     _copy_target = copy_root / relative_path
                     _copy_target.parent.mkdir(parents=True, exist_ok=True)
                     if not _copy_target.exists() or sha256_file(_copy_target) != sha256_file(path):
                         shutil.copy2(path, _copy_target)
-                kind = "json"
+                kind = "rewb" if path.suffix == BINARY_SUFFIX else "json"
                 checksum = sha256_file(path)
                 measurement_data = parse_measurement_json(path, relative_path=relative_path)
 
@@ -0,0 +1,133 @@
+import json
+import math
+import numpy as np
+
+CHUNK_SIZE = 8192
+
+_NON_FINITE = {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+
+def _format_value(value):
+    # float.__repr__ is what json uses for floats, so the text is identical
+    if type(value) is float:
+        if math.isfinite(value):
+            return float.__repr__(value)
+        return _NON_FINITE[repr(value)]
+    return json.dumps(value)
+
+
+def _format_chunk(chunk):
+    if isinstance(chunk, np.ndarray):
+        if chunk.dtype.kind == "f":
+            values = chunk.astype(np.float64).tolist()
+            text = list(map(float.__repr__, values))
+            if not np.all(np.isfinite(chunk)):
+                text = [_NON_FINITE.get(value, value) for value in text]
+            return text
+        chunk = chunk.tolist()
+    return [_format_value(value) for value in chunk]
+
+
+def _breaks(level, indent):
+    # line break + indent before an item, and before the closing bracket
+    if indent is None:
+        return "", ""
+    return ("\n" + " " * (indent * (level + 1)),
+            "\n" + " " * (indent * level))
+
+
+def _write_array(fp, values, level, indent, item_sep, chunk_size):
+    size = len(values)
+    if size == 0:
+        fp.write("[]")
+        return
+    inner, outer = _breaks(level, indent)
+    separator = item_sep + inner
+    fp.write("[" + inner)
+    for start in range(0, size, chunk_size):
+        if start:
+            fp.write(separator)
+        chunk = values[start:start + chunk_size]
+        fp.write(separator.join(_format_chunk(chunk)))
+    fp.write(outer + "]")
+
+
+def _write(fp, obj, level, indent, item_sep, key_sep, chunk_size):
+    if isinstance(obj, dict):
+        if not obj:
+            fp.write("{}")
+            return
+        inner, outer = _breaks(level, indent)
+        fp.write("{")
+        for index, (key, value) in enumerate(obj.items()):
+            fp.write((item_sep if index else "") + inner
+                     + json.dumps(str(key)) + key_sep)
+            _write(fp, value, level + 1, indent, item_sep, key_sep,
+                   chunk_size)
+        fp.write(outer + "}")
+    elif isinstance(obj, np.ndarray):
+        _write_array(fp, obj.ravel(), level, indent, item_sep, chunk_size)
+    elif isinstance(obj, (list, tuple)):
+        if any(isinstance(value, (dict, list, tuple, np.ndarray))
+               for value in obj):
+            # nested containers are rare here, write them one by one
+            _write_nested(fp, obj, level, indent, item_sep, key_sep,
+                          chunk_size)
+        else:
+            _write_array(fp, obj, level, indent, item_sep, chunk_size)
+    elif isinstance(obj, np.generic):
+        fp.write(_format_value(obj.item()))
+    else:
+        fp.write(_format_value(obj))
+
+
+def _write_nested(fp, values, level, indent, item_sep, key_sep, chunk_size):
+    inner, outer = _breaks(level, indent)
+    fp.write("[")
+    for index, value in enumerate(values):
+        fp.write((item_sep if index else "") + inner)
+        _write(fp, value, level + 1, indent, item_sep, key_sep, chunk_size)
+    fp.write(outer + "]")
+
+
+def dump(obj, fp, indent: int = 4, chunk_size: int = CHUNK_SIZE):
+    """ Function to write obj as json to an open text file, bit by bit
+
+    Arrays are formatted chunk_size values at a time and written straight
+    to fp, so no full copy of the data as python lists or as one big string
+    is ever held in memory. With indent the output is byte for byte what
+    json.dump(obj, fp, indent=indent) writes for the same values. With
+    indent=None it is the compact form without any whitespace.
+
+    Args:
+        obj (dict | list): the data, values may be numpy arrays
+        fp (file): a file opened for writing text
+        indent (int | None): spaces per level, None for compact output
+        chunk_size (int): values formatted per write
+
+    Returns:
+        N/A
+    """
+    if indent is None:
+        item_sep, key_sep = ",", ":"
+    else:
+        item_sep, key_sep = ",", ": "
+    _write(fp, obj, 0, indent, item_sep, key_sep, chunk_size)
+
+
+def dump_file(obj, file_path, indent: int = 4,
+              chunk_size: int = CHUNK_SIZE):
+    """ Function to stream obj as json into a file
+
+    Args:
+        obj (dict | list): the data, values may be numpy arrays
+        file_path (str | Path): the file to write
+        indent (int | None): spaces per level, None for compact output
+        chunk_size (int): values formatted per write
+
+    Returns:
+        file_path (str | Path): the path of the written file
+    """
+    with open(file_path, "w", buffering=1024 * 1024) as fp:
+        dump(obj, fp, indent=indent, chunk_size=chunk_size)
+    return file_path
@@ -0,0 +1,199 @@
+import sys
+import numpy as np
+
+# /measurements keys kept in slots, the rest of a measurement goes to extra
+_REW_KEYS = {
+    "title": "title",
+    "notes": "notes",
+    "date": "date",
+    "uuid": "uuid",
+    "rewVersion": "rew_version",
+    "startFreq": "start_freq",
+    "endFreq": "end_freq",
+}
+
+# default of the fields REW didn't send, they read as None but are not keys
+_UNSET = object()
+
+
+def _as_curve(values):
+    if values is None:
+        return None
+    if isinstance(values, np.ndarray) and not values.flags.writeable \
+            and values.dtype.isnative:
+        # shared read-only arrays, e.g. the axes from freq_axis, are kept
+        # as they are instead of being copied into every record
+        return values
+    curve = np.array(values, dtype=np.float32).ravel()
+    curve.setflags(write=False)
+    return curve
+
+
+class MeasurementRecord():
+    __slots__ = ("id", "title", "notes", "date", "uuid", "rew_version",
+                 "start_freq", "end_freq", "extra", "missing", "freq", "spl",
+                 "smoothing")
+
+    def __init__(self, id: str, title: str = _UNSET, notes: str = _UNSET,
+                 date: str = _UNSET, uuid: str = _UNSET,
+                 rew_version: str = _UNSET, start_freq: float = _UNSET,
+                 end_freq: float = _UNSET, extra: dict = None):
+        """ Initializes a compact measurement record
+
+        Holds the fields of one /measurements entry as attributes and the
+        curves, once attached, as float32 arrays. Fields can still be read
+        with the REW key names (record["rewVersion"], record.get("title")),
+        so a record can be passed wherever a /measurements entry was. Fields
+        that weren't given read as None but, as in the entry, are not keys.
+
+        Args:
+            id (str): the REW measurement id
+            title (str): the measurement title
+            notes (str): the measurement notes
+            date (str): the measurement date
+            uuid (str): the measurement uuid
+            rew_version (str): the REW version that made the measurement
+            start_freq (float): the start frequency
+            end_freq (float): the end frequency
+            extra (dict | None): any other fields REW sent, kept as
+                                 (key, value) pairs which are smaller
+                                 than a dict for the few keys left
+
+        Returns:
+            N/A
+        """
+        fields = {"title": title, "notes": notes, "date": date, "uuid": uuid,
+                  "rew_version": rew_version, "start_freq": start_freq,
+                  "end_freq": end_freq}
+        self.id = str(id)
+        missing = []
+        for slot, value in fields.items():
+            if value is _UNSET:
+                missing.append(slot)
+                value = None
+            setattr(self, slot, value)
+        # the slots REW didn't send, usually none
+        self.missing = frozenset(missing) if missing else None
+        self.extra = tuple(extra.items()) if extra else None
+        self.freq = None
+        self.spl = None
+        self.smoothing = None
+
+    @classmethod
+    def from_rew(cls, id, measurement: dict):
+        """ Function to make a record from one /measurements entry
+
+        Args:
+            id (str): the REW measurement id
+            measurement (dict): the entry from /measurements
+
+        Returns:
+            record (MeasurementRecord): the record
+        """
+        fields = {}
+        extra = {}
+        for key, value in measurement.items():
+            slot = _REW_KEYS.get(key)
+            if slot is None:
+                extra[key] = value
+            elif slot == "rew_version" and isinstance(value, str):
+                # every measurement repeats the version, share one string
+                fields[slot] = sys.intern(value)
+            else:
+                fields[slot] = value
+        return cls(id, extra=extra, **fields)
+
+    def set_curve(self, freq, spl, smoothing=None):
+        """ Function to attach the frequency response to the record
+
+        Args:
+            freq (np.ndarray | list): the frequency axis
+            spl (np.ndarray | list): the SPL data
+            smoothing (str | None): the smoothing applied to the response
+
+        Returns:
+            record (MeasurementRecord): this record
+        """
+        self.freq = _as_curve(freq)
+        self.spl = _as_curve(spl)
+        self.smoothing = smoothing
+        return self
+
+    def _has_slot(self, slot: str):
+        return self.missing is None or slot not in self.missing
+
+    def __getitem__(self, key: str):
+        slot = _REW_KEYS.get(key)
+        if slot is not None:
+            if not self._has_slot(slot):
+                raise KeyError(key)
+            return getattr(self, slot)
+        for extra_key, value in self.extra or ():
+            if extra_key == key:
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str):
+        slot = _REW_KEYS.get(key)
+        if slot is not None:
+            return self._has_slot(slot)
+        return any(extra_key == key for extra_key, _ in self.extra or ())
+
+    def to_dict(self):
+        """ Function to get the record back as a /measurements entry """
+        measurement = {key: getattr(self, slot)
+                       for key, slot in _REW_KEYS.items()
+                       if self._has_slot(slot)}
+        if self.extra:
+            measurement.update(self.extra)
+        return measurement
+
+    def to_json(self, filename: str = None):
+        """ Function to get the record in the marimo json schema
+
+        Nothing is converted until this is called, the curves are returned
+        as arrays for json_stream or binary_export to write.
+
+        Args:
+            filename (str | None): the export name, the title if None
+
+        Returns:
+            data (dict): filename, Freq(Hz), SPL(dB) and Meta Data
+        """
+        return {
+            "filename": filename or self.title,
+            "Freq(Hz)": self.freq if self.freq is not None else [],
+            "SPL(dB)": self.spl if self.spl is not None else [],
+            "Meta Data": {
+                "REW Version": self.rew_version,
+                "Dated": self.date,
+                "UUID": self.uuid,
+                "notes": self.notes,
+                "Measurement": self.title,
+                "Start Frequency": self.start_freq,
+                "End Frequency": self.end_freq,
+                "Smoothing": self.smoothing,
+            },
+        }
+
+    def __repr__(self):
+        return f"MeasurementRecord({self.id!r}, title={self.title!r})"
+
+
+def measurement_records(measurements: dict):
+    """ Function to turn a /measurements response into records
+
+    Args:
+        measurements (dict): the /measurements response, keyed by id
+
+    Returns:
+        records (dict): MeasurementRecord keyed by measurement id
+    """
+    return {str(meas_id): MeasurementRecord.from_rew(meas_id, meas)
+            for meas_id, meas in measurements.items()}
@@ -1,8 +1,8 @@
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
-#     "jsonpickle>=4.1.1",
 #     "marimo>=0.19.0",
+#     "numpy>=2.0",
 #     "pyzmq>=27.1.0",
 #     "requests>=2.32.5",
 # ]
@@ -24,6 +24,8 @@ with app.setup:
     from data_handling import Data_Handling
     from LEA_controls import Lea_Settings
     from REW_measurements import Measurements
+    from export_pipeline import ExportPipeline
+    from measurement_record import measurement_records
     from project_paths import get_mdat_dir, get_json_dir, ensure_data_dirs
     import marimo as mo
     import pathlib as Path
@@ -60,7 +62,8 @@ def _():
 @app.cell
 def _():
     if __name__ == "__main__":
-        # instantiate on local host port 4735
+        # instantiate on local host port 4735, attaching to an REW that is
+        # already running there instead of launching another one
 
         # define names for the imported classes
         rewA = REWAutomation()
@@ -79,9 +82,12 @@ def _():
         # Lea.websocket_connect(Lea_address, Lea.mute())
         # Lea.websocket_connect(Lea_address, Lea.unmute())
 
-        while rewA.is_server_setup() is False:
-            # wait for server to be ready
-            pass
+        if not rewA.wait_until_ready(timeout=120.0):
+            raise TimeoutError("REW did not answer within 120 seconds")
+        print(f"REW is ready after "
+              f"{rewA.startup_metrics['seconds_to_ready']:.2f} s")
+        # mirror REW's current settings so unchanged ones are not re-sent
+        rewA.sync_config()
 
         ifDone = False
         stillRunning = True
@@ -321,6 +327,8 @@ def _():
     mo.md(r"""
     ### Smoothing (optional)
     Select a smoothing option to apply to the frequency response.
+    1/N octave smoothing is applied locally to the unsmoothed response,
+    the other options are requested from REW.
     """)
     return
 
@@ -364,7 +372,7 @@ def _(load_button, rewA):
 
     time.sleep(3)
     with mo.status.spinner(title="Fetching data..."):
-        measurements_all = rewA.get_measurements()
+        measurements_all = measurement_records(rewA.get_measurements())
     return (measurements_all,)
 
 
@@ -383,33 +391,55 @@ def _(measNum, measurements_all):
 
 
 @app.cell
-def _(export_json_name_value, measNum, measurement, rewA, smoothing_select):
+def _(
+    dataH,
+    export_json_name_value,
+    measNum,
+    measurement,
+    rewA,
+    smoothing_select,
+):
     rewVersion = measurement["rewVersion"]
     selected_smoothing = smoothing_select.value
     if selected_smoothing == "Default":
         selected_smoothing = None
+    # the unsmoothed response is fetched once and then served from the
+    # response cache, switching between 1/N octave choices needs no request
+    local_smoothing = dataH.can_smooth_locally(selected_smoothing)
     response = rewA.get_measurements_id_freq_response(
         measNum,
-        smoothing=selected_smoothing,
+        smoothing="None" if local_smoothing else selected_smoothing,
     )
     rmag = response["magnitude"]
     dummy=export_json_name_value
     # response, rewVersion
     selected_smoothing
     response
-    return response, selected_smoothing
+    return local_smoothing, response, selected_smoothing
 
 
 @app.cell
-def _(dataH, response):
+def _(dataH, local_smoothing, response, selected_smoothing):
     decoded_array = dataH.decode_array(response["magnitude"])
+    if local_smoothing:
+        decoded_array = dataH.smooth(
+            decoded_array,
+            dataH.build_freq_array_from_response(response, len(decoded_array)),
+            selected_smoothing,
+        )
     # decoded_array
     return (decoded_array,)
 
 
 @app.cell
-def _(dataH, decoded_array, response):
+def _(dataH, decoded_array, measurement, response, selected_smoothing):
     freq_array = dataH.build_freq_array_from_response(response, len(decoded_array))
+    # the record keeps the curves as float32 until it is exported
+    measurement.set_curve(
+        freq_array,
+        decoded_array,
+        selected_smoothing or response.get("smoothing"),
+    )
     # freq_array
     return (freq_array,)
 
@@ -439,30 +469,22 @@ def _(export_json_name_value):
 @app.cell
 def _(
     dataH,
-    decoded_array,
     export_json_name_value,
     freq_array,
     json_outpath,
     make_json_button,
     measurement,
-    response,
-    selected_smoothing,
     measNum,
 ):
     mo.stop(not export_json_name_value)
     if make_json_button.value:
-        smoothing = response.get("smoothing") if isinstance(response, dict) else None
-        if selected_smoothing:
-            smoothing = selected_smoothing
+        # freq_array: the curves are attached to measurement in its cell
         _timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         _base_name = f"{_timestamp}__ID{measNum}__{export_json_name_value}"
         _export_name = dataH.sanitize_filename(_base_name)
-        dataH.make_marimo_json(
-            _export_name,
+        dataH.write_record(
             measurement,
-            decoded_array,
-            freq_array,
-            smoothing=smoothing,
+            _export_name,
             filepath=json_outpath,
         )
     else:
@@ -475,45 +497,81 @@ def _():
     mo.md(r"""
     ### Export All Measurements
     Export all measurements into `data/json` using the same naming scheme.
+    The binary format writes float32 columns to `.rewb` files, which are
+    smaller and faster to write and load than JSON.
     """)
     return
 
 
 @app.cell
 def _():
+    export_format_select = mo.ui.dropdown(
+        options=["json", "binary"],
+        value="json",
+        label="Export format",
+    )
     export_all_button = mo.ui.run_button(label="Export All Measurements")
-    export_all_button
-    return (export_all_button,)
+    export_format_select, export_all_button
+    return export_all_button, export_format_select
 
 
 @app.cell
-def _(dataH, export_all_button, measurements_all, rewA):
+def _(dataH, export_all_button, export_format_select, measurements_all, rewA):
     mo.stop(not export_all_button.value, mo.md("Click to export all measurements."))
 
     export_all_dir = get_json_dir()
-
-    for _meas_id, _meas in measurements_all.items():
-        response_all = rewA.get_measurements_id_freq_response(str(_meas_id))
-        decoded_array_all = dataH.decode_array(response_all["magnitude"])
-        freq_array_all = dataH.build_freq_array_from_response(
-            response_all,
-            len(decoded_array_all),
-        )
-        smoothing_all = response_all.get("smoothing") if isinstance(response_all, dict) else None
-        filename_all = _meas.get("title", f"measurement_{_meas_id}")
-        _timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        _base_name = f"{_timestamp}__ID{_meas_id}__{filename_all}"
-        _export_name = dataH.sanitize_filename(_base_name)
-        dataH.make_marimo_json(
-            _export_name,
-            _meas,
-            decoded_array_all,
-            freq_array_all,
-            smoothing=smoothing_all,
+    export_pipeline = ExportPipeline(rewA, dataH)
+
+    with mo.status.progress_bar(
+        total=len(measurements_all),
+        title="Exporting measurements",
+    ) as _bar:
+        export_result = export_pipeline.run(
+            measurements_all,
             filepath=str(export_all_dir),
+            progress=lambda _done, _total, _meas_id: _bar.update(),
+            export_format=export_format_select.value,
         )
 
-    mo.md(rf"Exported to: `{str(export_all_dir)}`")
+    _timing_lines = "\n".join(
+        f"- {_stage}: {_t['items']} items, {_t['mean_ms']:.1f} ms avg"
+        for _stage, _t in export_result["timings"].items()
+    )
+    _error_lines = "\n".join(
+        f"- ID {_meas_id}: {_exc}"
+        for _meas_id, _exc in export_result["errors"].items()
+    )
+    mo.md(
+        rf"Exported {len(export_result['exported'])} measurements to: "
+        rf"`{str(export_all_dir)}` in {export_result['wall_seconds']:.2f} s"
+        + "\n\n" + _timing_lines
+        + ("\n\n**Errors:**\n" + _error_lines if _error_lines else "")
+    )
+    return
+
+
+@app.cell
+def _():
+    mo.md(r"""
+    ## REW Request Timing
+    ---
+    Per-endpoint call counts, latency percentiles, bytes and errors since
+    REW was connected.
+    """)
+    return
+
+
+@app.cell
+def _():
+    metrics_refresh_button = mo.ui.run_button(label="Refresh timing")
+    metrics_refresh_button
+    return (metrics_refresh_button,)
+
+
+@app.cell
+def _(metrics_refresh_button, rewA):
+    _ = metrics_refresh_button.value
+    mo.ui.table(rewA.metrics.rows(), label="REW requests", selection=None)
     return
 
 
@@ -537,7 +595,7 @@ def _():
 @app.cell
 def _(exit_REW_button, rewA):
     if exit_REW_button.value:
-        rewA.post_command_shutdown()
+        rewA.shutdown()
         print("REW is shut down")
     else:
         print("REW is not shut down")
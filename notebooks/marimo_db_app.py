@@ -23,10 +23,15 @@ with app.setup:
     import os
     from datetime import datetime
     import psycopg
-    import json
     import matplotlib.pyplot as plt
     from project_paths import get_data_root
     from import_local_files import import_files
+    from downsample import PlotCurveCache
+    from benchmarks import BENCHMARK_FILES, default_store
+    from overlay import plot_overlay
+
+    # downsampled curves by file checksum, kept across cell reruns
+    plot_curves = PlotCurveCache()
 
 
 @app.cell
@@ -188,6 +193,7 @@ def _(
             m.measured_at,
             COALESCE(f.kind, '') AS kind,
             COALESCE(f.relative_path, '') AS relative_path,
+            COALESCE(f.checksum_sha256, '') AS checksum_sha256,
             COALESCE(h.base_url, '') AS base_url
         FROM measurement_file f
         LEFT JOIN measurement m ON f.measurement_id = m.id
@@ -231,14 +237,14 @@ def _(records):
 def _():
     mo.md(r"""
     ## Plot JSON
-    Select a JSON file to plot SPL vs Frequency.
+    Select a JSON or binary (`.rewb`) file to plot SPL vs Frequency.
     """)
     return
 
 
 @app.cell
 def _(records):
-    json_paths = [r.get("relative_path") for r in records if r.get("kind") == "json"]
+    json_paths = [r.get("relative_path") for r in records if r.get("kind") in ("json", "rewb")]
     plot_select = mo.ui.dropdown(
         options=json_paths,
         value=json_paths[0] if json_paths else None,
@@ -249,7 +255,7 @@ def _(records):
 
 
 @app.cell
-def _(plot_select):
+def _(plot_select, records):
     mo.stop(not plot_select.value, mo.md("Select a JSON file to plot."))
 
     shared_root = get_data_root()
@@ -272,23 +278,109 @@ def _(plot_select):
             ),
         )
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    freq = data.get("Freq(Hz)", [])
-    spl = data.get("SPL(dB)", [])
+    checksum = next(
+        (r.get("checksum_sha256") for r in records
+         if r.get("relative_path") == plot_select.value),
+        "",
+    )
 
     fig, ax = plt.subplots()
-    ax.semilogx(freq, spl)
+    # about one min/max pair per pixel column of the axes
+    plot_width = int(fig.get_figwidth() * fig.dpi * ax.get_position().width)
+    curve = plot_curves.load(json_path, checksum=checksum, buckets=plot_width)
+
+    ax.semilogx(curve["freq"], curve["spl"])
     ax.set_xlabel("Frequency (Hz)")
     ax.set_ylabel("SPL (dB)")
-    ax.set_title(data.get("filename", "SPL vs Frequency"))
+    ax.set_title(curve["filename"] or "SPL vs Frequency")
     ax.grid(True, which="both", ls="--", alpha=0.4)
 
     fig
     return (fig,)
 
 
+@app.cell
+def _():
+    mo.md(r"""
+    ## Overlay
+    Plot many JSON or binary files on top of each other, e.g. a production
+    lot, with an optional benchmark envelope and percentile band.
+    """)
+    return
+
+
+@app.cell
+def _(records):
+    overlay_files = {}
+    for r in records:
+        if r.get("kind") not in ("json", "rewb"):
+            continue
+        title = r.get("title") or r.get("relative_path")
+        label = f"{r.get('file_id')}: {title}"
+        overlay_files[label] = (r.get("relative_path"), r.get("checksum_sha256"))
+
+    overlay_select = mo.ui.multiselect(
+        options=list(overlay_files),
+        label="Select files to overlay",
+    )
+    overlay_benchmark = mo.ui.dropdown(
+        options=["None"] + list(BENCHMARK_FILES),
+        value="None",
+        label="Benchmark",
+    )
+    overlay_band = mo.ui.checkbox(label="P5-P95 band")
+    mo.hstack([overlay_select, overlay_benchmark, overlay_band], justify="start")
+    return overlay_band, overlay_benchmark, overlay_files, overlay_select
+
+
+@app.cell
+def _(overlay_band, overlay_benchmark, overlay_files, overlay_select):
+    mo.stop(not overlay_select.value, mo.md("Select files to overlay."))
+
+    _shared_root = get_data_root()
+    _local_root = repo_root / "data"
+    _files = []
+    _missing = []
+    for _label in overlay_select.value:
+        _relative_path, _checksum = overlay_files[_label]
+        for _root in (_shared_root, _local_root):
+            if (_root / _relative_path).exists():
+                _files.append((_root / _relative_path, _checksum))
+                break
+        else:
+            _missing.append(_relative_path)
+
+    overlay_fig, _ax = plt.subplots(figsize=(9, 5))
+    _plot_width = int(overlay_fig.get_figwidth() * overlay_fig.dpi
+                      * _ax.get_position().width)
+    _curves, _errors = plot_curves.load_many(_files, buckets=_plot_width)
+
+    _benchmark = None
+    if overlay_benchmark.value != "None":
+        _benchmark_path = repo_root / BENCHMARK_FILES[overlay_benchmark.value]
+        if _benchmark_path.exists():
+            _benchmark = default_store().load(str(_benchmark_path))
+        else:
+            _missing.append(str(_benchmark_path))
+
+    plot_overlay(
+        _ax,
+        _curves,
+        benchmark=_benchmark,
+        percentiles=(5, 95) if overlay_band.value else None,
+    )
+    _ax.set_xlabel("Frequency (Hz)")
+    _ax.set_ylabel("SPL (dB)")
+    _ax.set_title(f"{len(_curves)} measurements")
+    _ax.grid(True, which="both", ls="--", alpha=0.4)
+    _ax.legend(loc="lower left")
+
+    _skipped = _missing + list(_errors)
+    mo.vstack([
+        overlay_fig,
+        mo.md("Skipped: " + ", ".join(f"`{p}`" for p in _skipped)) if _skipped else mo.md(""),
+    ])
+    return (overlay_fig,)
 
 
 @app.cell
@@ -0,0 +1,114 @@
+import warnings
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+def log_grid(curves, points: int = 400):
+    """ Function to get a log-spaced frequency grid covering every curve
+
+    Args:
+        curves (list): downsampled curves, dicts with 'freq'
+        points (int): grid points
+
+    Returns:
+        grid (np.ndarray): the frequencies, empty if no curve has any
+    """
+    lows = [curve["freq"][curve["freq"] > 0].min(initial=np.inf)
+            for curve in curves]
+    highs = [curve["freq"].max(initial=-np.inf) for curve in curves]
+    low = min(lows, default=np.inf)
+    high = max(highs, default=-np.inf)
+    if not np.isfinite(low) or not high > low:
+        return np.zeros(0)
+    return np.geomspace(low, high, points)
+
+
+def percentile_band(curves, grid, percentiles=(5, 95)):
+    """ Function to get the spread of many curves on a common grid
+
+    Every curve is interpolated on a log axis onto grid, points outside a
+    curve's range are left out instead of extrapolated.
+
+    Args:
+        curves (list): downsampled curves, dicts with 'freq' and 'spl'
+        grid (np.ndarray): the frequencies of the band
+        percentiles (tuple): the (low, high) percentiles of the band
+
+    Returns:
+        (low, high) (np.ndarray, np.ndarray): the band, NaN where no curve
+                                              covers the grid
+    """
+    if not curves:
+        return np.full(grid.size, np.nan), np.full(grid.size, np.nan)
+    stacked = np.full((len(curves), grid.size), np.nan)
+    log_points = np.log(grid)
+    for row, curve in zip(stacked, curves):
+        freq = curve["freq"]
+        valid = freq > 0
+        if np.count_nonzero(valid) < 2:
+            continue
+        log_freq = np.log(freq[valid])
+        row[:] = np.interp(log_points, log_freq, curve["spl"][valid],
+                           left=np.nan, right=np.nan)
+    with warnings.catch_warnings():
+        # grid points no curve covers are NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, high = np.nanpercentile(stacked, percentiles, axis=0)
+    return low, high
+
+
+def plot_overlay(ax, curves, benchmark=None, percentiles=None,
+                 grid_points: int = 400, alpha: float = None):
+    """ Function to draw many curves on one semilog axes
+
+    All curves go into a single LineCollection, so drawing 500 units is
+    one artist instead of 500 Line2D objects. The benchmark envelope
+    (the Upper/Lower columns written by benchmark_builder) and a
+    percentile band of the curves are drawn as shaded areas.
+
+    Args:
+        ax (matplotlib.axes.Axes): the axes to draw on
+        curves (list): downsampled curves, dicts with 'freq' and 'spl'
+        benchmark (Benchmark | None): benchmark whose SPL(dB) and, if it
+                                      has them, Upper(dB)/Lower(dB) are
+                                      drawn
+        percentiles (tuple | None): (low, high) percentiles of the band,
+                                    no band if None
+        grid_points (int): points of the band and the benchmark
+        alpha (float | None): line opacity, lower with more curves if None
+
+    Returns:
+        lines (LineCollection): the collection holding the curves
+    """
+    if alpha is None:
+        alpha = min(1.0, max(0.05, 10.0 / max(len(curves), 1)))
+    segments = [np.column_stack((curve["freq"], curve["spl"]))
+                for curve in curves]
+    lines = LineCollection(segments, linewidths=0.8, alpha=alpha,
+                           color="tab:blue", label=f"{len(curves)} units")
+    ax.add_collection(lines)
+    ax.set_xscale("log")
+
+    grid = log_grid(curves, grid_points)
+    if percentiles is not None and grid.size:
+        low, high = percentile_band(curves, grid, percentiles)
+        ax.fill_between(grid, low, high, color="tab:orange", alpha=0.35,
+                        label=f"P{percentiles[0]:g}-P{percentiles[1]:g}")
+
+    if benchmark is not None and benchmark.freq is not None:
+        freq = benchmark.freq
+        if grid.size:
+            # the benchmark is dense, only the plotted range is kept
+            grid = grid[(grid >= freq[0]) & (grid <= freq[-1])]
+        else:
+            grid = np.geomspace(max(freq[0], 1e-3), freq[-1], grid_points)
+        columns = benchmark.columns
+        if "Upper(dB)" in columns and "Lower(dB)" in columns:
+            ax.fill_between(grid, np.interp(grid, freq, columns["Lower(dB)"]),
+                            np.interp(grid, freq, columns["Upper(dB)"]),
+                            color="tab:green", alpha=0.2, label="envelope")
+        ax.plot(grid, np.interp(grid, freq, benchmark.spl), color="tab:green",
+                linewidth=1.2, label="benchmark")
+
+    ax.autoscale_view()
+    return lines
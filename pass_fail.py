@@ -0,0 +1,410 @@
+import weakref
+from functools import lru_cache
+import numpy as np
+
+
+class PassFailResult():
+    __slots__ = ("passed", "failed_count", "allowed_failures",
+                 "checked_count", "failing_bins")
+
+    def __init__(self, passed, failed_count, allowed_failures, checked_count,
+                 failing_bins):
+        """ Initializes the outcome of one pass/fail check
+
+        Args:
+            passed (bool): True if the unit passed
+            failed_count (int): bins in the band outside the threshold
+            allowed_failures (int): failures allowed before the unit fails
+            checked_count (int): bins inside the evaluation band
+            failing_bins (np.ndarray): indices of the failing bins
+
+        Returns:
+            N/A
+        """
+        self.passed = passed
+        self.failed_count = failed_count
+        self.allowed_failures = allowed_failures
+        self.checked_count = checked_count
+        self.failing_bins = failing_bins
+
+    def __bool__(self):
+        return bool(self.passed)
+
+    def __repr__(self):
+        return (f"PassFailResult(passed={self.passed}, "
+                f"failed_count={self.failed_count}, "
+                f"allowed_failures={self.allowed_failures}, "
+                f"checked_count={self.checked_count})")
+
+
+class PassFailEngine():
+    def __init__(self, freq_array, low_freq: float = 30.0,
+                 high_freq: float = 10000.0):
+        """ Initializes a pass/fail check compiled for one frequency grid
+
+        The evaluation band is turned into a boolean mask once, so every
+        unit measured on this grid is judged with one vectorized compare
+        and count.
+
+        Args:
+            freq_array (np.ndarray | list): the frequency of every bin
+            low_freq (float): lowest frequency that is checked
+            high_freq (float): highest frequency that is checked
+
+        Returns:
+            N/A
+        """
+        self.freq_array = np.asarray(freq_array, dtype=np.float64)
+        self.low_freq = low_freq
+        self.high_freq = high_freq
+        self.mask = ((self.freq_array >= low_freq)
+                     & (self.freq_array <= high_freq))
+        self.mask.setflags(write=False)
+        self.band_bins = np.flatnonzero(self.mask)
+        self.checked_count = int(self.band_bins.size)
+
+    def evaluate(self, diff_array, threshold: float = 25.0,
+                 fail_count: int = 900, min_length: int = 0):
+        """ Function to judge one unit from its deviation to the benchmark
+
+        Args:
+            diff_array (np.ndarray | list): benchmark minus measured, one
+                                            value per bin of the grid
+            threshold (float): largest allowed absolute deviation in dB
+            fail_count (int): failing bins allowed before the unit fails
+            min_length (int): the unit fails if diff_array is shorter
+
+        Returns:
+            result (PassFailResult): the outcome and the failing bins
+        """
+        diff = np.asarray(diff_array, dtype=np.float64)
+        bins = self.band_bins
+        if diff.size < self.mask.size:
+            # a short measurement is only checked where it has data
+            bins = bins[bins < diff.size]
+        failing = bins[np.abs(diff[bins]) > threshold]
+        failed_count = int(failing.size)
+        passed = failed_count <= fail_count and diff.size >= min_length
+        return PassFailResult(passed, failed_count, fail_count,
+                              int(bins.size), failing)
+
+
+# compiled objects keyed by id() of the frequency array, the weak reference
+# makes sure a recycled id of a freed array is not mistaken for the old grid
+_grid_cache = {}
+
+
+def cached_for_grid(freq_array, key, factory, cache=None):
+    """ Function to build something for a frequency grid once
+
+    Args:
+        freq_array (np.ndarray | list): the frequency of every bin
+        key (tuple): what is built, e.g. ("engine", low, high)
+        factory (callable): called with freq_array on a cache miss
+        cache (dict | None): where the entry is kept, the module's grid
+                             cache if None
+
+    Returns:
+        compiled (object): the cached or newly built object
+    """
+    if not isinstance(freq_array, np.ndarray):
+        return factory(freq_array)
+    if cache is None:
+        cache = _grid_cache
+    key = (id(freq_array),) + key
+    cached = cache.get(key)
+    if cached is not None and cached[0]() is freq_array:
+        return cached[1]
+    compiled = factory(freq_array)
+    try:
+        ref = weakref.ref(freq_array,
+                          lambda _, key=key: cache.pop(key, None))
+    except TypeError:
+        return compiled
+    cache[key] = (ref, compiled)
+    return compiled
+
+
+def engine_for(freq_array, low_freq: float = 30.0,
+               high_freq: float = 10000.0):
+    """ Function to get the compiled engine of a frequency grid
+
+    Frequency axes from Data_Handling are shared arrays, so looking the
+    engine up by array identity means the band mask is built once per grid
+    rather than once per unit.
+
+    Args:
+        freq_array (np.ndarray | list): the frequency of every bin
+        low_freq (float): lowest frequency that is checked
+        high_freq (float): highest frequency that is checked
+
+    Returns:
+        engine (PassFailEngine): the engine for this grid and band
+    """
+    return cached_for_grid(
+        freq_array, ("engine", low_freq, high_freq),
+        lambda grid: PassFailEngine(grid, low_freq, high_freq))
+
+
+class ToleranceBand():
+    __slots__ = ("low_freq", "high_freq", "upper", "lower",
+                 "allowed_failures")
+
+    def __init__(self, low_freq: float, high_freq: float,
+                 upper: float, lower: float, allowed_failures: int = 0):
+        """ Initializes one frequency band of a tolerance mask
+
+        Args:
+            low_freq (float): lowest frequency of the band
+            high_freq (float): highest frequency of the band
+            upper (float): dB the unit may be above the benchmark
+            lower (float): dB the unit may be below the benchmark
+            allowed_failures (int): bins of this band allowed outside
+
+        Returns:
+            N/A
+        """
+        self.low_freq = low_freq
+        self.high_freq = high_freq
+        self.upper = upper
+        self.lower = lower
+        self.allowed_failures = allowed_failures
+
+    def __repr__(self):
+        return (f"ToleranceBand({self.low_freq}, {self.high_freq}, "
+                f"upper={self.upper}, lower={self.lower}, "
+                f"allowed_failures={self.allowed_failures})")
+
+
+class ToleranceResult():
+    __slots__ = ("passed", "failed_counts", "allowed_failures",
+                 "violations")
+
+    def __init__(self, passed, failed_counts, allowed_failures, violations):
+        """ Initializes the outcome of a tolerance mask check
+
+        Args:
+            passed (bool): True if no band had too many failures
+            failed_counts (np.ndarray): failing bins per band
+            allowed_failures (np.ndarray): allowed failures per band
+            violations (np.ndarray): boolean, True where a bin is outside
+
+        Returns:
+            N/A
+        """
+        self.passed = passed
+        self.failed_counts = failed_counts
+        self.allowed_failures = allowed_failures
+        self.violations = violations
+
+    @property
+    def failing_bins(self):
+        return np.flatnonzero(self.violations)
+
+    def __bool__(self):
+        return bool(self.passed)
+
+    def __repr__(self):
+        return (f"ToleranceResult(passed={self.passed}, "
+                f"failed_counts={self.failed_counts.tolist()}, "
+                f"allowed_failures={self.allowed_failures.tolist()})")
+
+
+class CompiledLimits():
+    def __init__(self, spec, freq_array):
+        """ Initializes a tolerance mask compiled for one frequency grid
+
+        Every bin gets the upper/lower tolerance of the band it falls in
+        (where bands overlap the later band wins) and +/-inf outside all
+        bands, so one vectorized compare judges the whole curve.
+
+        Args:
+            spec (ToleranceSpec): the tolerance mask
+            freq_array (np.ndarray | list): the frequency of every bin
+
+        Returns:
+            N/A
+        """
+        freq = np.asarray(freq_array, dtype=np.float64)
+        self.spec = spec
+        self.size = freq.size
+        self.upper = np.full(freq.size, np.inf)
+        self.lower = np.full(freq.size, -np.inf)
+        self.band_index = np.full(freq.size, -1, dtype=np.intp)
+        for index, band in enumerate(spec.bands):
+            in_band = (freq >= band.low_freq) & (freq <= band.high_freq)
+            self.upper[in_band] = band.upper
+            self.lower[in_band] = -band.lower
+            self.band_index[in_band] = index
+        self.allowed_failures = np.array(
+            [band.allowed_failures for band in spec.bands], dtype=np.int64)
+        for array in (self.upper, self.lower, self.band_index):
+            array.setflags(write=False)
+        # bins of every band, a slice when they are one run (the usual
+        # case on an ascending grid) so batches are counted without copies
+        self.band_bins = []
+        for index in range(len(spec.bands)):
+            bins = np.flatnonzero(self.band_index == index)
+            if bins.size and bins[-1] - bins[0] + 1 == bins.size:
+                bins = slice(int(bins[0]), int(bins[-1]) + 1)
+            self.band_bins.append(bins)
+
+    def limits(self, bench_array):
+        """ Function to get the absolute limit curves around a benchmark
+
+        Args:
+            bench_array (np.ndarray | list): the benchmark curve
+
+        Returns:
+            (upper, lower) (np.ndarray, np.ndarray): the limit curves
+        """
+        bench = np.asarray(bench_array, dtype=np.float64)
+        return bench + self.upper, bench + self.lower
+
+    def judge_deviation(self, deviation):
+        """ Function to judge a unit from measured minus benchmark
+
+        Args:
+            deviation (np.ndarray | list): measured minus benchmark, one
+                                           value per bin
+
+        Returns:
+            result (ToleranceResult): the outcome per band
+        """
+        dev = np.asarray(deviation, dtype=np.float64)
+        size = min(dev.size, self.size)
+        dev = dev[:size]
+        violations = (dev > self.upper[:size]) | (dev < self.lower[:size])
+        failed_counts = np.bincount(self.band_index[:size][violations],
+                                    minlength=len(self.spec.bands))
+        passed = bool(np.all(failed_counts <= self.allowed_failures)) \
+            and size >= self.spec.min_length
+        return ToleranceResult(passed, failed_counts, self.allowed_failures,
+                               violations)
+
+    def judge_deviation_batch(self, deviations, lengths=None):
+        """ Function to judge many units at once from measured minus benchmark
+
+        Args:
+            deviations (np.ndarray): one row per unit, one column per bin
+            lengths (np.ndarray | None): points each unit really had, units
+                                         shorter than min_length fail
+
+        Returns:
+            (passed, failed_counts, violations_per_bin):
+                passed (np.ndarray): bool per unit
+                failed_counts (np.ndarray): failing bins per unit and band
+                violations_per_bin (np.ndarray): failing units per bin
+        """
+        dev = np.asarray(deviations)
+        if dev.ndim != 2 or dev.shape[1] != self.size:
+            raise ValueError(f"expected rows of {self.size} bins, "
+                             f"got shape {dev.shape}")
+        violations = (dev > self.upper) | (dev < self.lower)
+        failed_counts = np.empty((dev.shape[0], len(self.band_bins)),
+                                 dtype=np.int64)
+        for index, bins in enumerate(self.band_bins):
+            failed_counts[:, index] = np.count_nonzero(
+                violations[:, bins], axis=1)
+        passed = np.all(failed_counts <= self.allowed_failures, axis=1)
+        if lengths is not None:
+            passed &= np.asarray(lengths) >= self.spec.min_length
+        elif self.size < self.spec.min_length:
+            passed[:] = False
+        return passed, failed_counts, np.count_nonzero(violations, axis=0)
+
+    def judge(self, measured, bench_array):
+        """ Function to judge a measured curve against its benchmark
+
+        Args:
+            measured (np.ndarray | list): the measured curve
+            bench_array (np.ndarray | list): the benchmark on the same grid
+
+        Returns:
+            result (ToleranceResult): the outcome per band
+        """
+        measured = np.asarray(measured, dtype=np.float64)
+        bench = np.asarray(bench_array, dtype=np.float64)
+        size = min(measured.size, bench.size)
+        return self.judge_deviation(measured[:size] - bench[:size])
+
+
+class ToleranceSpec():
+    def __init__(self, name: str, bands, min_length: int = 0):
+        """ Initializes the tolerance mask of one unit type
+
+        Args:
+            name (str): the unit type, e.g. "ResonX"
+            bands (list): the ToleranceBand of every checked range
+            min_length (int): the unit fails with fewer points than this
+
+        Returns:
+            N/A
+        """
+        self.name = name
+        self.bands = tuple(bands)
+        self.min_length = min_length
+        # compiled limits by grid, kept on the spec so they go with it
+        self._limits = {}
+
+    def compile(self, freq_array):
+        """ Function to get the limits of this mask on a frequency grid
+
+        Compiled limits are cached per grid, the same way as engine_for,
+        but on the spec itself, so a spec that is dropped (e.g. a one-off
+        default mask) doesn't stay alive in the module's grid cache.
+
+        Args:
+            freq_array (np.ndarray | list): the frequency of every bin
+
+        Returns:
+            limits (CompiledLimits): the per-bin limits
+        """
+        return cached_for_grid(freq_array, ("limits",),
+                               lambda grid: CompiledLimits(self, grid),
+                               cache=self._limits)
+
+    def __repr__(self):
+        return f"ToleranceSpec({self.name!r}, {list(self.bands)})"
+
+
+def _default_bands():
+    # today's single global check: +/-25 dB from 30 Hz to 10 kHz with 900
+    # failing bins allowed, kept per unit type so each can be tuned alone
+    return [ToleranceBand(30.0, 10000.0, upper=25.0, lower=25.0,
+                          allowed_failures=900)]
+
+
+@lru_cache(maxsize=32)
+def default_spec(PFthreshold: float = 25.0, fail_count: int = 900,
+                 low_freq: float = 30.0, high_freq: float = 10000.0,
+                 min_length: int = 54000):
+    """ Function to get the mask of the unit_pass_fail check
+
+    One spec is kept per set of arguments, so its compiled limits are
+    reused instead of being rebuilt for every batch.
+
+    Args:
+        PFthreshold (float): allowed deviation in dB
+        fail_count (int): allowed failing bins
+        low_freq (float): lowest checked frequency
+        high_freq (float): highest checked frequency
+        min_length (int): units with fewer points fail
+
+    Returns:
+        spec (ToleranceSpec): the shared mask
+    """
+    return ToleranceSpec("default", [ToleranceBand(
+        low_freq, high_freq, upper=PFthreshold, lower=PFthreshold,
+        allowed_failures=fail_count)], min_length=min_length)
+
+
+# tolerance masks by unit type, named as in Data_Handling.get_unit_type
+UNIT_TOLERANCES = {
+    "ResonX": ToleranceSpec("ResonX", _default_bands(), min_length=54000),
+    "Bass Shaker": ToleranceSpec("Bass Shaker", _default_bands(),
+                                 min_length=54000),
+    "Exciter": ToleranceSpec("Exciter", _default_bands(), min_length=54000),
+    "Thruster": ToleranceSpec("Thruster", _default_bands(),
+                              min_length=54000),
+}
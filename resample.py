@@ -0,0 +1,133 @@
+import weakref
+import numpy as np
+
+
+def is_log_spaced(freq_array, rtol: float = 1e-6):
+    """ Function to check if a frequency axis has a constant ratio (ppo)
+
+    Args:
+        freq_array (np.ndarray): the frequency axis
+        rtol (float): relative tolerance on the step
+
+    Returns:
+        log_spaced (bool): True for a log axis, False for anything else
+    """
+    freq = np.asarray(freq_array, dtype=np.float64)
+    if freq.size < 3 or freq[0] <= 0:
+        return False
+    linear_steps = np.diff(freq)
+    if np.allclose(linear_steps, linear_steps[0], rtol=rtol, atol=0.0):
+        return False
+    log_steps = np.diff(np.log(freq))
+    return bool(np.allclose(log_steps, log_steps[0], rtol=rtol, atol=0.0))
+
+
+class InterpWeights():
+    def __init__(self, source_freq, target_freq, log: bool = None):
+        """ Initializes interpolation from one frequency grid to another
+
+        For every target bin the two neighbouring source bins and their
+        weights are worked out once, resampling a curve is then two gathers
+        and a multiply-add. A log spaced source axis is interpolated in
+        log-frequency, a linear one in frequency. Targets outside the source
+        range take the nearest edge value, the same as np.interp.
+
+        Args:
+            source_freq (np.ndarray | list): the grid curves come in on
+            target_freq (np.ndarray | list): the grid curves are moved to
+            log (bool | None): interpolate in log-frequency, None decides
+                               from the source axis
+
+        Returns:
+            N/A
+        """
+        source = np.asarray(source_freq, dtype=np.float64)
+        target = np.asarray(target_freq, dtype=np.float64)
+        if log is None:
+            log = is_log_spaced(source)
+        self.log = log
+        self.source_size = source.size
+        self.target_size = target.size
+        if source.size < 2:
+            self.lower = np.zeros(target.size, dtype=np.intp)
+            self.upper = self.lower
+            self.weight = np.zeros(target.size)
+            return
+        if log:
+            source = np.log(np.maximum(source, np.finfo(np.float64).tiny))
+            target = np.log(np.maximum(target, np.finfo(np.float64).tiny))
+        lower = np.searchsorted(source, target, side="right") - 1
+        lower = np.clip(lower, 0, source.size - 2)
+        span = source[lower + 1] - source[lower]
+        weight = np.divide(target - source[lower], span,
+                           out=np.zeros(target.size), where=span != 0)
+        self.lower = lower
+        self.upper = lower + 1
+        self.weight = np.clip(weight, 0.0, 1.0)
+
+    def apply(self, values):
+        """ Function to resample a curve onto the target grid
+
+        Args:
+            values (np.ndarray | list): one value per source bin, or a 2-D
+                                        array with one curve per row
+
+        Returns:
+            resampled (np.ndarray): one value per target bin
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[-1] != self.source_size:
+            raise ValueError(f"expected {self.source_size} values per curve, "
+                             f"got {values.shape[-1]}")
+        low = values[..., self.lower]
+        high = values[..., self.upper]
+        return low + (high - low) * self.weight
+
+
+# weights keyed by id() of both grids, the weak references make sure a
+# recycled id of a freed array is not mistaken for the old grid
+_weights_cache = {}
+
+
+def weights_for(source_freq, target_freq, log: bool = None):
+    """ Function to get the cached interpolation between two grids
+
+    Frequency axes from Data_Handling and benchmark columns are shared
+    arrays, so the weights of a (measured grid, benchmark grid) pair are
+    built once and reused for every unit of a batch.
+
+    Args:
+        source_freq (np.ndarray | list): the grid curves come in on
+        target_freq (np.ndarray | list): the grid curves are moved to
+        log (bool | None): interpolate in log-frequency, None decides from
+                           the source axis
+
+    Returns:
+        weights (InterpWeights): the interpolation between the grids
+    """
+    if not (isinstance(source_freq, np.ndarray)
+            and isinstance(target_freq, np.ndarray)):
+        return InterpWeights(source_freq, target_freq, log)
+    key = (id(source_freq), id(target_freq), log)
+    cached = _weights_cache.get(key)
+    if cached is not None and cached[0]() is source_freq \
+            and cached[1]() is target_freq:
+        return cached[2]
+    weights = InterpWeights(source_freq, target_freq, log)
+
+    def drop(_, key=key):
+        _weights_cache.pop(key, None)
+
+    _weights_cache[key] = (weakref.ref(source_freq, drop),
+                           weakref.ref(target_freq, drop), weights)
+    return weights
+
+
+def same_grid(source_freq, target_freq):
+    """ Function to check if two frequency axes are the same grid """
+    if source_freq is target_freq:
+        return True
+    source = np.asarray(source_freq, dtype=np.float64)
+    target = np.asarray(target_freq, dtype=np.float64)
+    return source.shape == target.shape and bool(
+        np.allclose(source, target, rtol=1e-7, atol=0.0))
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """ Function to estimate how many bytes a decoded json value holds
+
+    Only strings, containers and arrays (by nbytes) are counted in detail,
+    every other value counts as 8 bytes. This is close enough to keep the
+    cache bounded since the base64 magnitude/phase strings make up almost
+    all of a response.
+
+    Args:
+        value: the decoded json value
+
+    Returns:
+        size (int): the estimated size in bytes
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        # numpy arrays, e.g. downsampled curves
+        return nbytes
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v)
+                   for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 8
+
+
+class ResponseCache():
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """ Initializes a thread safe LRU cache bounded by byte size
+
+        Args:
+            max_bytes (int): the max estimated size of all cached values,
+                             least recently used entries are evicted first
+
+        Returns:
+            N/A
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """ Function to get a cached value and mark it as recently used
+
+        Args:
+            key (tuple): the cache key
+
+        Returns:
+            value: the cached value, or None if it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """ Function to cache a value, evicting old entries when over size
+
+        Values bigger than max_bytes on their own are not cached.
+
+        Args:
+            key (tuple): the cache key
+            value: the value to be cached
+
+        Returns:
+            N/A
+        """
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def invalidate(self, predicate):
+        """ Function to drop every entry whose key matches predicate
+
+        Args:
+            predicate (callable): called with each key, True drops it
+
+        Returns:
+            removed (int): the number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self.current_bytes -= self._entries.pop(key)[1]
+        return len(keys)
+
+    def clear(self):
+        """ Function to drop every cached entry """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """ Function to get the cache counters
+
+        Returns:
+            stats (dict): entries, bytes, max_bytes, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,224 @@
+import asyncio
+from REWAutomation import (make_session, freq_response_request_ext,
+                           send_request)
+from rew_metrics import RequestMetrics
+
+
+class AsyncREWAutomation():
+    def __init__(self,
+                 rew=None,
+                 rew_address: str = "http://localhost",
+                 port: int = 4735,
+                 max_concurrency: int = 8,
+                 timeout: float | tuple = (3.05, 120.0)):
+        """ Initializes an asyncio client for the REW API
+
+        This is the async counterpart of REWAutomation. It does not launch
+        REW, it only talks to an API server that is already running. Each
+        request runs on a worker thread over a pooled keep-alive session and
+        a semaphore bounds how many requests are in flight at once, so many
+        GETs can be awaited together without flooding REW.
+
+        Args:
+            rew (REWAutomation | None): an existing REWAutomation whose
+                                        address, port, timeout and metrics
+                                        are reused
+            rew_address (str): the rew address
+            port (int): the port REW hosts on
+            max_concurrency (int): max number of requests in flight
+            timeout (float | tuple): default per-request timeout in seconds
+
+        Returns:
+            N/A
+        """
+        if rew is not None:
+            rew_address = rew.rew_address
+            port = rew.port
+            timeout = rew.timeout
+            # share the request accounting with the sync client
+            self.metrics = rew.metrics
+        else:
+            self.metrics = RequestMetrics()
+        self.rew_address = rew_address
+        self.port = port
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.session = make_session(pool_maxsize=max_concurrency)
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def close(self):
+        """ Function to close the pooled session and its connections
+
+        Args:
+            None
+
+        Returns:
+            N/A
+        """
+        self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _url(self, request_ext: str):
+        return self.rew_address + ":" + str(self.port) + request_ext
+
+    def _limit(self):
+        # a semaphore is bound to the event loop it first waits in, a new
+        # one is made for every loop (e.g. each asyncio.run of a cell)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _get(self, request_ext: str, timeout):
+        response = send_request(self.session, self.metrics, "GET",
+                                self._url(""), request_ext, timeout)
+        return response.json()
+
+    def _post(self, request_ext: str, data, timeout):
+        response = send_request(self.session, self.metrics, "POST",
+                                self._url(""), request_ext, timeout, data)
+        return response.json()
+
+    async def get_request(self, request_ext: str, timeout=None):
+        """ Function to make a GET request to the REW API
+
+        Args:
+            request_ext (str): the extension of the request to be made
+            timeout (float | tuple | None): overrides the default timeout
+
+        Returns:
+            response (dict): the response from the request
+        """
+        if timeout is None:
+            timeout = self.timeout
+        async with self._limit():
+            return await asyncio.to_thread(self._get, request_ext, timeout)
+
+    async def post_request(self, request_ext: str, data: dict, timeout=None):
+        """ Function to make a POST request to the REW API
+
+        Args:
+            request_ext (str): the extension of the request to be made
+            data (dict): the data to be sent in the request
+            timeout (float | tuple | None): overrides the default timeout
+
+        Returns:
+            response (dict): the response from the request
+        """
+        if timeout is None:
+            timeout = self.timeout
+        async with self._limit():
+            return await asyncio.to_thread(self._post, request_ext, data,
+                                           timeout)
+
+    async def get_application_commands(self):
+        """ Function to get all application commands """
+        return await self.get_request("/application/commands")
+
+    async def get_measurements(self):
+        """ Function to get all measurements """
+        return await self.get_request("/measurements")
+
+    async def get_measurements_id(self, id: str):
+        """ Function to get a measurement by its id# """
+        return await self.get_request("/measurements/" + str(id))
+
+    async def get_measurements_id_freq_response(self, id: str, smoothing=None,
+                                                unit=None, ppo=None):
+        """ Function to get the frequency response of a specified measurement
+
+        Args:
+            id (str): the id of the measurement
+            smoothing (str | None): smoothing option, e.g. "1/12"
+            unit (str | None): unit for magnitude, e.g. "SPL"
+            ppo (int | None): points-per-octave for log spacing
+
+        Returns:
+            measurement (dict): the frequency response of the measurement
+        """
+        return await self.get_request(
+            freq_response_request_ext(id, smoothing, unit, ppo)
+        )
+
+    async def get_measurements_frequency_response_smoothing_choices(self):
+        """ Function to get smoothing choices for frequency responses """
+        return await self.get_request(
+            "/measurements/frequency-response/smoothing-choices"
+        )
+
+    async def get_measurements_distortion(self, id: str):
+        """ Function to get the distortion of a specified measurement """
+        return await self.get_request(f"/measurements/{id}/distortion")
+
+    async def get_stepped_sine_progress(self):
+        """ Function to get the progress of the stepped sine sweep """
+        return await self.get_request("/stepped-measurement/progress")
+
+    async def get_last_input(self):
+        """ Function to get the last input used in REW """
+        return await self.get_request("/audio/asio/last-input")
+
+    async def get_many(self, request_exts):
+        """ Function to run many GET requests concurrently
+
+        At most max_concurrency requests are in flight at any time. Results
+        come back in the same order as request_exts.
+
+        Args:
+            request_exts (list): the request extensions to be fetched
+
+        Returns:
+            responses (list): the response for each request extension
+        """
+        return await asyncio.gather(
+            *(self.get_request(request_ext) for request_ext in request_exts)
+        )
+
+    async def get_freq_responses(self, ids, smoothing=None, unit=None,
+                                 ppo=None):
+        """ Function to fetch the frequency responses of many measurements
+
+        Args:
+            ids (list): the ids of the measurements to be retrieved
+            smoothing (str | None): smoothing option, e.g. "1/12"
+            unit (str | None): unit for magnitude, e.g. "SPL"
+            ppo (int | None): points-per-octave for log spacing
+
+        Returns:
+            responses (dict): frequency response keyed by measurement id
+        """
+        ids = [str(id) for id in ids]
+        responses = await self.get_many(
+            [freq_response_request_ext(id, smoothing, unit, ppo) for id in ids]
+        )
+        return dict(zip(ids, responses))
+
+    async def get_distortions(self, ids):
+        """ Function to fetch the distortion of many measurements
+
+        Args:
+            ids (list): the ids of the measurements to be retrieved
+
+        Returns:
+            responses (dict): distortion response keyed by measurement id
+        """
+        ids = [str(id) for id in ids]
+        responses = await self.get_many(
+            [f"/measurements/{id}/distortion" for id in ids]
+        )
+        return dict(zip(ids, responses))
+
+
+if __name__ == "__main__":
+    current_script_path = __file__
+    print(f'wrong file: {current_script_path}')
+    print("This file is not meant to be run directly.")
+    print("Please run the main script instead.")
@@ -0,0 +1,144 @@
+import json
+import re
+import threading
+import time
+from collections import deque
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(method: str, request_ext: str):
+    """ Function to group a request under its endpoint
+
+    The query string is dropped and numeric measurement ids are replaced by
+    {id}, so every frequency response fetch lands under one name.
+
+    Args:
+        method (str): the HTTP method, e.g. "GET"
+        request_ext (str): the request extension that was sent
+
+    Returns:
+        name (str): e.g. "GET /measurements/{id}/frequency-response"
+    """
+    path = request_ext.split("?", 1)[0]
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))),
+                len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class RequestMetrics():
+    def __init__(self, sample_size: int = 2048):
+        """ Initializes per-endpoint request accounting
+
+        Counts, bytes and errors are exact. Latency percentiles are worked
+        out from the most recent sample_size calls of each endpoint so
+        memory stays bounded over a long station run.
+
+        Args:
+            sample_size (int): latencies kept per endpoint for percentiles
+
+        Returns:
+            N/A
+        """
+        self.sample_size = sample_size
+        self.started_at = time.time()
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, request_ext: str, seconds: float,
+               request_bytes: int = 0, response_bytes: int = 0,
+               error: bool = False):
+        """ Function to record one finished request
+
+        Args:
+            method (str): the HTTP method
+            request_ext (str): the request extension that was sent
+            seconds (float): wall time of the request
+            request_bytes (int): size of the request body
+            response_bytes (int): size of the response body
+            error (bool): True if the request failed or REW returned >= 400
+
+        Returns:
+            N/A
+        """
+        name = endpoint_name(method, request_ext)
+        with self._lock:
+            stats = self._endpoints.get(name)
+            if stats is None:
+                stats = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "latencies": deque(maxlen=self.sample_size),
+                }
+                self._endpoints[name] = stats
+            stats["calls"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["request_bytes"] += request_bytes
+            stats["response_bytes"] += response_bytes
+            stats["latencies"].append(seconds)
+
+    def reset(self):
+        """ Function to drop every recorded request """
+        with self._lock:
+            self._endpoints = {}
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """ Function to get the metrics of every endpoint
+
+        Returns:
+            snapshot (dict): per endpoint name; calls, errors, total/mean/
+                             p50/p95/p99/max latency in ms and byte counts
+        """
+        with self._lock:
+            endpoints = {name: dict(stats, latencies=sorted(stats["latencies"]))
+                         for name, stats in self._endpoints.items()}
+        snapshot = {}
+        for name, stats in endpoints.items():
+            latencies = stats["latencies"]
+            calls = stats["calls"]
+            snapshot[name] = {
+                "calls": calls,
+                "errors": stats["errors"],
+                "total_ms": 1000.0 * stats["total_seconds"],
+                "mean_ms": 1000.0 * stats["total_seconds"] / calls,
+                "p50_ms": 1000.0 * _percentile(latencies, 0.50),
+                "p95_ms": 1000.0 * _percentile(latencies, 0.95),
+                "p99_ms": 1000.0 * _percentile(latencies, 0.99),
+                "max_ms": 1000.0 * stats["max_seconds"],
+                "request_bytes": stats["request_bytes"],
+                "response_bytes": stats["response_bytes"],
+            }
+        return snapshot
+
+    def rows(self):
+        """ Function to get the snapshot as table rows, slowest total first
+
+        Returns:
+            rows (list): one dict per endpoint, ready for mo.ui.table
+        """
+        rows = [dict(endpoint=name, **stats)
+                for name, stats in self.snapshot().items()]
+        for row in rows:
+            for key, value in row.items():
+                if isinstance(value, float):
+                    row[key] = round(value, 2)
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def to_json(self, indent: int = 2):
+        """ Function to get the snapshot as a json string """
+        return json.dumps({"started_at": self.started_at,
+                           "endpoints": self.snapshot()}, indent=indent)
@@ -0,0 +1,423 @@
+"""Local stand-in for the REW API used to benchmark the client offline.
+
+Serves the endpoints REWAutomation, Measurements and the notebooks use,
+with synthetic measurements, configurable latency and payload size, so the
+client can be exercised on a machine without REW or audio hardware.
+
+    python rew_simulator.py --measurements 60 --latency 0.005
+    python rew_simulator.py --bench 3
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DISTORTION_COLUMNS = ["Freq (Hz)", "Fundamental (dB)", "THD (%)",
+                      "THD+N (%)", "N (%)", "Noise (%)", "H2 (%)", "H3 (%)",
+                      "H4 (%)", "H5 (%)", "H6 (%)", "H7 (%)", "H8 (%)",
+                      "H9 (%)", "H10 (%)"]
+
+SMOOTHING_CHOICES = ["None", "1/1", "1/2", "1/3", "1/6", "1/12", "1/24",
+                     "1/48", "Var", "Psy", "ERB"]
+
+
+def encode_floats(values):
+    """ Function to base64 encode floats as big-endian float32, like REW
+
+    Args:
+        values (list): the values to be encoded
+
+    Returns:
+        encoded (str): the base64 encoded array
+    """
+    packed = array("f", values)
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+class SimulatedREW():
+    def __init__(self,
+                 measurement_count: int = 10,
+                 points: int = 54613,
+                 start_freq: float = 2.1972656,
+                 freq_step: float = 0.36621097,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 step_seconds: float = 0.2,
+                 seed: int = 0):
+        """ Initializes the simulated REW state
+
+        Args:
+            measurement_count (int): measurements present at start
+            points (int): samples per frequency response
+            start_freq (float): first frequency of the linear axis
+            freq_step (float): step of the linear axis
+            latency (float): seconds added to every request
+            jitter (float): max random seconds added on top of latency
+            step_seconds (float): simulated time per stepped sine point
+            seed (int): seed for the synthetic curves
+
+        Returns:
+            N/A
+        """
+        self.points = points
+        self.start_freq = start_freq
+        self.freq_step = freq_step
+        self.latency = latency
+        self.jitter = jitter
+        self.step_seconds = step_seconds
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.config = {
+            "/stepped-measurement/frequency-span": {
+                "startFreq": 50.0, "endFreq": 1000.0, "ppo": 3},
+        }
+        self.measurements = {}
+        self._payloads = {}
+        self._stepped = None
+        self.request_count = 0
+        for _ in range(measurement_count):
+            self.add_measurement()
+
+    def add_measurement(self, title: str = None, stepped_points: int = 0):
+        """ Function to add one synthetic measurement
+
+        Args:
+            title (str | None): the measurement title
+            stepped_points (int): rows of distortion data, 0 for a sweep
+
+        Returns:
+            meas_id (str): the id of the new measurement
+        """
+        with self.lock:
+            meas_id = str(len(self.measurements) + 1)
+            end_freq = self.start_freq + self.freq_step * (self.points - 1)
+            self.measurements[meas_id] = {
+                "title": title or f"Sim {meas_id}",
+                "notes": "",
+                "date": datetime.now().strftime("%Y-%b-%d %H:%M:%S"),
+                "uuid": str(uuid.uuid4()),
+                "rewVersion": "REW API simulator",
+                "startFreq": self.start_freq,
+                "endFreq": end_freq,
+                "steppedPoints": stepped_points,
+            }
+            return meas_id
+
+    def load(self):
+        """ Function to simulate loading a .mdat, replacing measurements """
+        with self.lock:
+            count = len(self.measurements)
+            self.measurements = {}
+            self._payloads = {}
+        for _ in range(max(count, 1)):
+            self.add_measurement()
+
+    def _curve(self, meas_id: str, freqs):
+        rng = random.Random(f"{self.seed}:{meas_id}")
+        resonance = rng.uniform(40.0, 120.0)
+        level = rng.uniform(80.0, 90.0)
+        values = []
+        for freq in freqs:
+            f = max(freq, 1.0)
+            rolloff = -12.0 * math.log2(max(resonance / f, 1.0))
+            bump = 6.0 / (1.0 + (math.log2(f / resonance) * 4.0) ** 2)
+            values.append(level + rolloff + bump + rng.gauss(0.0, 0.3))
+        return values
+
+    def frequency_response(self, meas_id: str, query: dict):
+        """ Function to build a /frequency-response reply
+
+        Args:
+            meas_id (str): the id of the measurement
+            query (dict): the parsed query string
+
+        Returns:
+            response (dict): the reply body
+        """
+        smoothing = unquote(query.get("smoothing", [""])[0]).strip('"')
+        ppo = query.get("ppo", [None])[0]
+        key = (meas_id, ppo)
+        with self.lock:
+            payload = self._payloads.get(key)
+        if payload is None:
+            if ppo:
+                ppo = int(ppo)
+                ratio = 2.0 ** (1.0 / ppo)
+                count = int(math.log2(20000.0 / 20.0) * ppo) + 1
+                freqs = [20.0 * ratio ** i for i in range(count)]
+                axis = {"startFreq": 20.0, "ppo": ppo}
+            else:
+                freqs = [self.start_freq + i * self.freq_step
+                         for i in range(self.points)]
+                axis = {"startFreq": self.start_freq,
+                        "freqStep": self.freq_step}
+            magnitude = encode_floats(self._curve(meas_id, freqs))
+            phase = encode_floats([0.0] * len(freqs))
+            payload = dict(axis, magnitude=magnitude, phase=phase)
+            with self.lock:
+                self._payloads[key] = payload
+        return dict(payload, unit="SPL",
+                    smoothing=smoothing or "None")
+
+    def distortion(self, meas_id: str):
+        """ Function to build a /distortion reply """
+        rows = self.measurements[meas_id].get("steppedPoints") or 14
+        span = self.config["/stepped-measurement/frequency-span"]
+        ratio = 2.0 ** (1.0 / float(span.get("ppo", 3)))
+        rng = random.Random(f"{self.seed}:dist:{meas_id}")
+        data = []
+        for i in range(rows):
+            harmonics = [rng.uniform(0.001, 0.5) for _ in range(9)]
+            thd = math.sqrt(sum(h * h for h in harmonics))
+            noise = rng.uniform(0.001, 0.05)
+            data.append([float(span.get("startFreq", 50.0)) * ratio ** i,
+                         rng.uniform(80.0, 95.0), thd, thd + noise, noise,
+                         noise] + harmonics)
+        return {"columnHeaders": DISTORTION_COLUMNS, "data": data}
+
+    def start_stepped(self):
+        """ Function to start a simulated stepped sine sweep """
+        span = self.config["/stepped-measurement/frequency-span"]
+        octaves = math.log2(float(span["endFreq"]) / float(span["startFreq"]))
+        points = int(math.ceil(octaves * float(span["ppo"]))) + 1
+        with self.lock:
+            self._stepped = {"started": time.monotonic(), "points": points}
+
+    def stepped_progress(self):
+        """ Function to build a /stepped-measurement/progress reply """
+        with self.lock:
+            stepped = self._stepped
+        if stepped is None:
+            span = self.config["/stepped-measurement/frequency-span"]
+            octaves = math.log2(float(span["endFreq"])
+                                / float(span["startFreq"]))
+            points = int(math.ceil(octaves * float(span["ppo"]))) + 1
+            return {"point": 0, "points": points,
+                    "message": f"{points} measurements required",
+                    "timeRemainingSeconds": 0}
+        points = stepped["points"]
+        elapsed = time.monotonic() - stepped["started"]
+        point = int(elapsed / self.step_seconds) + 1
+        if point > points:
+            with self.lock:
+                self._stepped = None
+            self.add_measurement(stepped_points=points)
+            return self.stepped_progress()
+        remaining = (points - point + 1) * self.step_seconds
+        return {"point": point, "points": points,
+                "message": f"Measuring point {point} of {points}",
+                "timeRemainingSeconds": round(remaining, 1)}
+
+    def handle_get(self, path: str, query: dict):
+        """ Function to route a GET request
+
+        Returns:
+            (status, body): the HTTP status and the reply body
+        """
+        parts = [p for p in path.split("/") if p]
+        if path == "/version":
+            return 200, {"message": "REW API simulator"}
+        if path == "/application/commands":
+            return 200, ["Shutdown"]
+        if path == "/measurements":
+            with self.lock:
+                return 200, {k: dict(v) for k, v in self.measurements.items()}
+        if path == "/measurements/frequency-response/smoothing-choices":
+            return 200, SMOOTHING_CHOICES
+        if path == "/stepped-measurement/progress":
+            return 200, self.stepped_progress()
+        if path == "/audio/asio/last-input":
+            return 200, {"input": "2: Dante rx 2"}
+        if len(parts) >= 2 and parts[0] == "measurements":
+            meas_id = parts[1]
+            if meas_id not in self.measurements:
+                return 404, {"message": f"No measurement {meas_id}"}
+            if len(parts) == 2:
+                return 200, dict(self.measurements[meas_id])
+            if parts[2] == "frequency-response":
+                return 200, self.frequency_response(meas_id, query)
+            if parts[2] == "distortion":
+                return 200, self.distortion(meas_id)
+        if path in self.config:
+            return 200, self.config[path]
+        return 404, {"message": f"Unknown endpoint {path}"}
+
+    def handle_post(self, path: str, body):
+        """ Function to route a POST request
+
+        Returns:
+            (status, body): the HTTP status and the reply body
+        """
+        command = body.get("command") if isinstance(body, dict) else None
+        if path == "/measure/command":
+            meas_id = self.add_measurement(self.config.get(
+                "/measure/naming", {}).get("title"))
+            return 202, {"message": f"Measurement {meas_id} added"}
+        if path == "/measurements/command" and command == "Load":
+            self.load()
+            return 200, {"message": "Loaded"}
+        if path == "/stepped-measurement/command" and command == "start":
+            self.start_stepped()
+            return 202, {"message": "Stepped measurement started"}
+        if path == "/application/command" and command == "Shutdown":
+            return 200, {"message": "Shutting down"}
+        self.config[path] = body
+        return 200, {"message": f"{path} updated"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes, without TCP_NODELAY a
+    # keep-alive client waits ~40 ms on delayed ACK for every reply
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, body):
+        sim = self.server.sim
+        delay = sim.latency + (random.uniform(0.0, sim.jitter)
+                               if sim.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.server.sim.request_count += 1
+        url = urlsplit(self.path)
+        self._reply(*self.server.sim.handle_get(url.path, parse_qs(url.query)))
+
+    def do_POST(self):
+        self.server.sim.request_count += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            self._reply(400, {"message": "Invalid JSON"})
+            return
+        path = urlsplit(self.path).path
+        self._reply(*self.server.sim.handle_post(path, body))
+        if path == "/application/command" and isinstance(body, dict) \
+                and body.get("command") == "Shutdown":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int = 4735, host: str = "127.0.0.1", **sim_kwargs):
+    """ Function to start the simulator on a background thread
+
+    Args:
+        port (int): the port to serve on, 0 picks a free port
+        host (str): the address to bind
+        **sim_kwargs: passed on to SimulatedREW
+
+    Returns:
+        server (ThreadingHTTPServer): the running server, its .sim
+                                      attribute is the SimulatedREW and
+                                      server.server_address[1] the port
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.sim = SimulatedREW(**sim_kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def run_benchmark(port: int, rounds: int = 1, concurrency: int = 8):
+    """ Function to time fetching every frequency response from the server
+
+    Args:
+        port (int): the port the simulator is serving on
+        rounds (int): times to repeat each fetch pattern
+        concurrency (int): max requests in flight for the async client
+
+    Returns:
+        results (dict): seconds and requests per second per fetch pattern
+    """
+    import asyncio
+    from REWAutomation import REWAutomation
+    from rew_async import AsyncREWAutomation
+
+    results = {}
+    rew = REWAutomation(rew_address="http://127.0.0.1", port=port,
+                        launch="never", cache_max_bytes=0)
+    ids = list(rew.get_measurements().keys())
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for meas_id in ids:
+            rew.get_measurements_id_freq_response(meas_id)
+    elapsed = time.perf_counter() - start
+    results["sequential"] = {"seconds": elapsed,
+                             "requests_per_second": rounds * len(ids) / elapsed}
+    rew.close()
+
+    async def fetch_all():
+        async with AsyncREWAutomation(rew_address="http://127.0.0.1",
+                                      port=port,
+                                      max_concurrency=concurrency) as client:
+            for _ in range(rounds):
+                await client.get_freq_responses(ids)
+
+    start = time.perf_counter()
+    asyncio.run(fetch_all())
+    elapsed = time.perf_counter() - start
+    results["concurrent"] = {"seconds": elapsed,
+                             "requests_per_second": rounds * len(ids) / elapsed}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=4735)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--measurements", type=int, default=10)
+    parser.add_argument("--points", type=int, default=54613)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--step-seconds", type=float, default=0.2)
+    parser.add_argument("--bench", type=int, default=0, metavar="ROUNDS",
+                        help="run a client benchmark and exit")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server(port=args.port, host=args.host,
+                          measurement_count=args.measurements,
+                          points=args.points, latency=args.latency,
+                          jitter=args.jitter, step_seconds=args.step_seconds)
+    port = server.server_address[1]
+    if args.bench:
+        results = run_benchmark(port, rounds=args.bench,
+                                concurrency=args.concurrency)
+        for name, result in results.items():
+            print(f"{name}: {result['seconds']:.3f} s, "
+                  f"{result['requests_per_second']:.1f} req/s")
+        server.shutdown()
+        return
+    print(f"REW API simulator listening on http://{args.host}:{port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import numpy as np
+from pass_fail import cached_for_grid
+
+
+def octave_fraction(smoothing):
+    """ Function to get N of a 1/N octave smoothing choice
+
+    Args:
+        smoothing (str | None): the REW smoothing choice, e.g. "1/12"
+
+    Returns:
+        fraction (int | None): N for "1/N", 0 for no smoothing ("None" or
+                               None) and None for choices that are not
+                               fractional octave (e.g. "Var", "Psy", "ERB")
+    """
+    if smoothing is None:
+        return 0
+    value = str(smoothing).strip().strip('"')
+    if value == "" or value.lower() == "none":
+        return 0
+    numerator, _, denominator = value.partition("/")
+    if numerator.strip() != "1" or not denominator.strip().isdigit():
+        return None
+    fraction = int(denominator)
+    return fraction if fraction > 0 else None
+
+
+# windows summing to less than this share of the cumulative sum up to their
+# end are summed directly, which keeps the error of the rest below ~1e-9 dB
+_RELATIVE_FLOOR = 1e-4
+
+
+class OctaveWindows():
+    def __init__(self, freq_array, fraction: int):
+        """ Initializes the 1/N octave window of every bin of a grid
+
+        The window of a bin at f spans f * 2**(-1/2N) to f * 2**(1/2N). Its
+        first and last bin are found once with a binary search, smoothing a
+        curve is then a difference of two cumulative sums per bin. Windows
+        far below the running sum (e.g. past a 100 dB drop) lose their
+        digits in that difference, they are summed directly instead.
+
+        Args:
+            freq_array (np.ndarray | list): the frequency of every bin,
+                                            ascending, linear or log spaced
+            fraction (int): N of the 1/N octave smoothing
+
+        Returns:
+            N/A
+        """
+        freq = np.asarray(freq_array, dtype=np.float64)
+        half_width = 2.0 ** (1.0 / (2.0 * fraction))
+        self.fraction = fraction
+        self.size = freq.size
+        self.start = np.searchsorted(freq, freq / half_width, side="left")
+        self.stop = np.searchsorted(freq, freq * half_width, side="right")
+        # a bin is always in its own window, also at 0 Hz
+        self.start = np.minimum(self.start, np.arange(freq.size))
+        self.stop = np.maximum(self.stop, np.arange(freq.size) + 1)
+        self.count = self.stop - self.start
+
+    def apply(self, spl):
+        """ Function to smooth a dB curve by power averaging each window
+
+        Args:
+            spl (np.ndarray | list): the unsmoothed curve in dB, one value
+                                     per bin
+
+        Returns:
+            smoothed (np.ndarray): the smoothed curve in dB
+        """
+        spl = np.asarray(spl, dtype=np.float64)
+        if spl.size != self.size:
+            raise ValueError(f"expected {self.size} values, got {spl.size}")
+        if spl.size == 0:
+            return spl.copy()
+        # scaled to the peak so the running sum stays near 1 per bin
+        peak = np.max(spl)
+        power = np.power(10.0, (spl - peak) / 10.0)
+        cumulative = np.concatenate(([0.0], np.cumsum(power)))
+        total = cumulative[self.stop] - cumulative[self.start]
+        # the cumsum is off by about eps * cumulative[stop], windows whose
+        # sum isn't far above that are added up again from the powers
+        inexact = np.flatnonzero(total < _RELATIVE_FLOOR
+                                 * cumulative[self.stop])
+        if inexact.size:
+            # reduceat over (start, stop) pairs sums each window, the odd
+            # entries are the gaps between windows and are dropped
+            bounds = np.empty(2 * inexact.size, dtype=np.int64)
+            bounds[0::2] = self.start[inexact]
+            bounds[1::2] = self.stop[inexact]
+            padded = np.concatenate((power, [0.0]))
+            total[inexact] = np.add.reduceat(padded, bounds)[0::2]
+        mean = total / self.count
+        return 10.0 * np.log10(np.maximum(mean, np.finfo(np.float64).tiny)) \
+            + peak
+
+
+def octave_windows(freq_array, fraction: int):
+    """ Function to get the cached 1/N octave windows of a frequency grid
+
+    Args:
+        freq_array (np.ndarray | list): the frequency of every bin
+        fraction (int): N of the 1/N octave smoothing
+
+    Returns:
+        windows (OctaveWindows): the windows for this grid and fraction
+    """
+    return cached_for_grid(freq_array, ("octave", fraction),
+                           lambda grid: OctaveWindows(grid, fraction))
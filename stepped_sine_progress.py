@@ -0,0 +1,151 @@
+import asyncio
+import inspect
+import time
+
+
+class SteppedSineProgress():
+    def __init__(self, rew,
+                 min_interval: float = 0.1,
+                 max_interval: float = 2.0,
+                 start_timeout: float = 10.0,
+                 timeout: float | None = None):
+        """ Initializes a tracker for a running stepped sine sweep
+
+        Completion is worked out from the 'point' and 'points' fields of
+        /stepped-measurement/progress instead of comparing against one fixed
+        response, so it works for any frequency span. Between polls the
+        tracker sleeps for about half the time REW expects the next point to
+        take, so a long sweep is polled a few times per point instead of in
+        a tight loop.
+
+        Args:
+            rew (REWAutomation): the REW API client
+            min_interval (float): shortest time between polls in seconds
+            max_interval (float): longest time between polls in seconds
+            start_timeout (float): seconds to wait for the sweep to show as
+                                   running before an idle REW counts as done
+            timeout (float | None): overall deadline in seconds, None waits
+                                    until the sweep finishes
+
+        Returns:
+            N/A
+        """
+        self.rew = rew
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.start_timeout = start_timeout
+        self.timeout = timeout
+        self.started = False
+        self.last_progress = None
+
+    def _state(self, progress):
+        point = progress.get("point") or 0
+        points = progress.get("points") or 0
+        remaining = progress.get("timeRemainingSeconds") or 0
+        return point, points, remaining
+
+    def is_complete(self, progress: dict, elapsed: float):
+        """ Function to check if the sweep is finished
+
+        REW resets 'point' to 0 once the sweep is over, so after the sweep
+        has been seen running an idle response means it is done. REW reports
+        "point N of N" while the last point is still being measured, so
+        that only counts as done once no time is left.
+
+        Args:
+            progress (dict): a /stepped-measurement/progress response
+            elapsed (float): seconds since tracking started
+
+        Returns:
+            complete (bool): True if the sweep is finished
+        """
+        point, points, remaining = self._state(progress)
+        if points > 0 and point >= points and remaining <= 0:
+            return True
+        if point > 0 or remaining > 0:
+            self.started = True
+            return False
+        if self.started:
+            return True
+        return elapsed >= self.start_timeout
+
+    def next_interval(self, progress: dict):
+        """ Function to pick the sleep before the next poll
+
+        Args:
+            progress (dict): the last progress response
+
+        Returns:
+            interval (float): seconds to sleep
+        """
+        point, points, remaining = self._state(progress)
+        if remaining <= 0:
+            return self.min_interval
+        per_point = remaining / max(points - point, 1)
+        return min(max(per_point / 2.0, self.min_interval), self.max_interval)
+
+    def _check_timeout(self, elapsed: float):
+        if self.timeout is not None and elapsed >= self.timeout:
+            raise TimeoutError(
+                f"stepped sine sweep not finished after {self.timeout} s")
+
+    def iter_progress(self):
+        """ Generator that polls REW and yields each changed progress
+
+        The final progress response is always yielded.
+
+        Yields:
+            progress (dict): the /stepped-measurement/progress response
+        """
+        start = time.monotonic()
+        while True:
+            progress = self.rew.get_stepped_sine_progress()
+            elapsed = time.monotonic() - start
+            complete = self.is_complete(progress, elapsed)
+            if progress != self.last_progress or complete:
+                self.last_progress = progress
+                yield progress
+            if complete:
+                return
+            self._check_timeout(elapsed)
+            time.sleep(self.next_interval(progress))
+
+    async def aiter_progress(self):
+        """ Async generator version of iter_progress
+
+        Works with REWAutomation (the poll runs on a worker thread) and
+        with AsyncREWAutomation.
+
+        Yields:
+            progress (dict): the /stepped-measurement/progress response
+        """
+        start = time.monotonic()
+        while True:
+            get_progress = self.rew.get_stepped_sine_progress
+            if inspect.iscoroutinefunction(get_progress):
+                progress = await get_progress()
+            else:
+                progress = await asyncio.to_thread(get_progress)
+            elapsed = time.monotonic() - start
+            complete = self.is_complete(progress, elapsed)
+            if progress != self.last_progress or complete:
+                self.last_progress = progress
+                yield progress
+            if complete:
+                return
+            self._check_timeout(elapsed)
+            await asyncio.sleep(self.next_interval(progress))
+
+    def wait(self, callback=None):
+        """ Function to block until the sweep is finished
+
+        Args:
+            callback (callable | None): called with each changed progress
+
+        Returns:
+            progress (dict): the final progress response
+        """
+        for progress in self.iter_progress():
+            if callback is not None:
+                callback(progress)
+        return self.last_progress
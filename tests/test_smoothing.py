@@ -0,0 +1,30 @@
+import pathlib
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+from smoothing import OctaveWindows  # noqa: E402
+
+# the default 256k sweep axis
+FREQ = 2.1972656 + 0.36621097 * np.arange(54613)
+
+
+def brute_force(windows, spl):
+    power = np.power(10.0, spl / 10.0)
+    mean = [power[start:stop].mean()
+            for start, stop in zip(windows.start, windows.stop)]
+    return 10.0 * np.log10(mean)
+
+
+@pytest.mark.parametrize("drop", [0.0, 100.0, 120.0, 200.0])
+def test_power_average_survives_large_dynamic_range(drop):
+    spl = np.full(FREQ.size, 100.0)
+    spl[FREQ > 15000.0] -= drop
+    spl += np.random.default_rng(0).normal(0.0, 3.0, FREQ.size)
+    windows = OctaveWindows(FREQ, 48)
+
+    smoothed = windows.apply(spl)
+
+    np.testing.assert_allclose(smoothed, brute_force(windows, spl),
+                               rtol=0, atol=1e-6)